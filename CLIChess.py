@@ -1,20 +1,227 @@
 from src.CLIChess import CLIChess
+from src.Game.Board.Perft import run_perft_suite
+from src.Engine.Search import MAX_DEPTH
+from src.Engine.OpeningBook import OpeningBook
+from src.Engine.EngineErrors import InvalidBookError
+from src.Engine.Tablebase import Tablebase, DEFAULT_TABLEBASE_DIRECTORY, MAX_PIECES, parse_signature
+from src.Engine.TablebaseGenerator import generate_tablebases, all_signatures
+from src.Replay.Replay import replay_files, analyze_files
+from src.Replay.Regression import run_regression_suite
+from src.UCI.UCI import run_uci
+from src.Server.Server import run_server, DEFAULT_HOST, DEFAULT_PORT
+from src.Game.Profiler import Profiler, profiler_from_environment
+from src.Benchmark.Benchmark import run_benchmark_suite, DEFAULT_RESULTS_PATH, DEFAULT_THRESHOLD, DEFAULT_ROUNDS
 
 import sys
+import os
 import getopt
 
+DEFAULT_ENGINE_MOVETIME = 5000
+REPLAY_ARGUMENT_ERROR = "Replay argument error. Use \"replay [--filter Header=Value ...] file [file ...]\" with PGN (.pgn) or coordinate move files, or \"analyze [--workers N] [--filter Header=Value ...] file [file ...]\" to replay them across N processes.\n"
+TABLEBASE_ARGUMENT_ERROR = "Tablebase argument error. Use \"tablebase [--directory DIR] [3|4|signature ...]\" to generate every ending with up to 3 or 4 pieces, or only the named endings such as KQvK or KRvKP.\n"
+BENCHMARK_ARGUMENT_ERROR = "Benchmark argument error. Use \"bench [--output FILE] [--baseline FILE] [--threshold PERCENT] [--rounds N] [file ...]\" to time the board hot paths over the given coordinate move files (default test/*.txt), write the results as JSON, and compare them against a saved baseline.\n"
+SERVER_ARGUMENT_ERROR = "Server argument error. Use \"serve\" with optional --host HOST and --port PORT, or --socket PATH to listen on a Unix socket.\n"
+ARGUMENT_ERROR = "Optional argument error. Use no arguments, argument -l, or argument --letters to use the letter-based pieces. Use argument -p or --pieces to use unicode character pieces. Use --engine white or --engine black to play against the engine, optionally with --depth N, --movetime MS, --threads N, --book FILE, and --tablebase DIR. Use --profile to print call counts and timings at the end of each game, or --profile-json FILE to also write them as JSON.\n"
+
 def main(argv):
-	if not argv:
-		CLIChess("letters").run()
-	elif len(argv) == 1:
-		if argv[0] == "-p" or argv[0] == "--pieces":
-			CLIChess("pieces").run()
-		elif argv[0] == "-l" or argv[0] == "--letters":
-			CLIChess("letters").run()
-		else:
-			print("Optional argument error. Use no arguments, argument -l, or argument --letters to use the letter-based pieces. Use argument -p or --pieces to use unicode character pieces.\n")
-	else:
-		print("Optional argument error. Use no arguments, argument -l, or argument --letters to use the letter-based pieces. Use argument -p or --pieces to use unicode character pieces.\n")
+	if argv and argv[0] == "perft":
+		if len(argv) == 1:
+			sys.exit(0 if run_perft_suite(3) else 1)
+		elif len(argv) == 2 and argv[1].isdigit():
+			sys.exit(0 if run_perft_suite(int(argv[1])) else 1)
+		else:
+			print("Perft argument error. Use \"perft\" or \"perft depth\" to run the perft suite up to the given depth (default 3).\n")
+		return
+	elif argv and argv[0] == "regress":
+		if len(argv) == 1:
+			sys.exit(0 if run_regression_suite() else 1)
+		else:
+			print("Regression argument error. Use \"regress\" without further arguments to run the parser regression checks.\n")
+		return
+	elif argv and argv[0] == "uci":
+		run_uci()
+		return
+	elif argv and argv[0] == "serve":
+		server_arguments = parse_server_arguments(argv[1:])
+		if server_arguments is None:
+			print(SERVER_ARGUMENT_ERROR)
+		else:
+			run_server(*server_arguments)
+		return
+	elif argv and argv[0] == "bench":
+		benchmark_arguments = parse_benchmark_arguments(argv[1:])
+		if benchmark_arguments is None:
+			print(BENCHMARK_ARGUMENT_ERROR)
+		else:
+			sys.exit(0 if run_benchmark_suite(*benchmark_arguments) else 1)
+		return
+	elif argv and argv[0] == "tablebase":
+		tablebase_arguments = parse_tablebase_arguments(argv[1:])
+		if tablebase_arguments is None:
+			print(TABLEBASE_ARGUMENT_ERROR)
+		else:
+			generate_tablebases(*tablebase_arguments)
+		return
+	elif argv and (argv[0] == "replay" or argv[0] == "analyze"):
+		replay_arguments = parse_replay_arguments(argv[1:],argv[0] == "analyze")
+		if replay_arguments is None:
+			print(REPLAY_ARGUMENT_ERROR)
+		else:
+			paths, header_filter, workers = replay_arguments
+			if argv[0] == "analyze":
+				sys.exit(0 if analyze_files(paths,workers,header_filter) else 1)
+			else:
+				sys.exit(0 if replay_files(paths,header_filter) else 1)
+		return
+
+	try:
+		opts, args = getopt.getopt(argv,"lp",["letters","pieces","engine=","depth=","movetime=","threads=","book=","tablebase=","profile","profile-json="])
+	except getopt.GetoptError:
+		print(ARGUMENT_ERROR)
+		return
+	if args:
+		print(ARGUMENT_ERROR)
+		return
+
+	piece_display_type = "letters"
+	engine_color = None
+	engine_depth = None
+	engine_movetime = None
+	engine_threads = 1
+	book = None
+	tablebase = None
+	profiler = profiler_from_environment()
+	for opt, value in opts:
+		if opt == "-p" or opt == "--pieces":
+			piece_display_type = "pieces"
+		elif opt == "-l" or opt == "--letters":
+			piece_display_type = "letters"
+		elif opt == "--engine" and value in ("white","black"):
+			engine_color = value
+		elif opt == "--depth" and value.isdigit() and int(value) > 0:
+			engine_depth = int(value)
+		elif opt == "--movetime" and value.isdigit() and int(value) > 0:
+			engine_movetime = int(value)
+		elif opt == "--threads" and value.isdigit() and int(value) > 0:
+			engine_threads = int(value)
+		elif opt == "--book":
+			try:
+				book = OpeningBook(value)
+			except (OSError,InvalidBookError):
+				print("Opening book error. " + value + " is not a readable Polyglot (.bin) book.\n")
+				return
+		elif opt == "--tablebase":
+			tablebase = Tablebase(value)
+			if tablebase.max_pieces == 0:
+				print("Tablebase error. " + value + " contains no tablebase (.tb) files. Generate them with \"tablebase --directory " + value + "\".\n")
+				return
+		elif opt == "--profile":
+			if profiler is None:
+				profiler = Profiler()
+		elif opt == "--profile-json":
+			if profiler is None:
+				profiler = Profiler()
+			profiler.json_path = value
+		else:
+			print(ARGUMENT_ERROR)
+			return
+
+	if engine_depth is None:
+		engine_depth = MAX_DEPTH
+		if engine_movetime is None:
+			engine_movetime = DEFAULT_ENGINE_MOVETIME
+
+	CLIChess(piece_display_type,engine_color,engine_depth,engine_movetime,engine_threads,book,tablebase,profiler).run()
+
+def parse_replay_arguments(argv,allow_workers):
+	long_options = ["filter=","workers="] if allow_workers else ["filter="]
+	try:
+		opts, args = getopt.getopt(argv,"",long_options)
+	except getopt.GetoptError:
+		return None
+	if not args:
+		return None
+
+	header_filter = {}
+	workers = os.cpu_count() or 1
+	for opt, value in opts:
+		if opt == "--filter" and "=" in value:
+			key, header_value = value.split("=",1)
+			header_filter[key] = header_value
+		elif opt == "--workers" and value.isdigit() and int(value) > 0:
+			workers = int(value)
+		else:
+			return None
+	return args, header_filter or None, workers
+
+def parse_tablebase_arguments(argv):
+	try:
+		opts, args = getopt.getopt(argv,"",["directory="])
+	except getopt.GetoptError:
+		return None
+
+	directory = DEFAULT_TABLEBASE_DIRECTORY
+	for opt, value in opts:
+		if opt == "--directory":
+			directory = value
+		else:
+			return None
+
+	signatures = []
+	for arg in args or [str(MAX_PIECES-1)]:
+		if arg.isdigit() and 3 <= int(arg) <= MAX_PIECES:
+			signatures += all_signatures(int(arg))
+			continue
+		signature = parse_signature(arg)
+		if signature is None:
+			return None
+		signatures.append(signature)
+	return list(dict.fromkeys(signatures)), directory
+
+def parse_benchmark_arguments(argv):
+	try:
+		opts, args = getopt.getopt(argv,"",["output=","baseline=","threshold=","rounds="])
+	except getopt.GetoptError:
+		return None
+
+	output_path = DEFAULT_RESULTS_PATH
+	baseline_path = None
+	threshold = DEFAULT_THRESHOLD
+	rounds = DEFAULT_ROUNDS
+	for opt, value in opts:
+		if opt == "--output":
+			output_path = value
+		elif opt == "--baseline":
+			baseline_path = value
+		elif opt == "--threshold" and value.replace(".","",1).isdigit():
+			threshold = float(value)
+		elif opt == "--rounds" and value.isdigit() and int(value) > 0:
+			rounds = int(value)
+		else:
+			return None
+	return args or None, output_path, baseline_path, threshold, rounds
+
+def parse_server_arguments(argv):
+	try:
+		opts, args = getopt.getopt(argv,"",["host=","port=","socket="])
+	except getopt.GetoptError:
+		return None
+	if args:
+		return None
+
+	host = DEFAULT_HOST
+	port = DEFAULT_PORT
+	socket_path = None
+	for opt, value in opts:
+		if opt == "--host":
+			host = value
+		elif opt == "--port" and value.isdigit():
+			port = int(value)
+		elif opt == "--socket":
+			socket_path = value
+		else:
+			return None
+	return host, port, socket_path
 
 if __name__ == "__main__":
 	main(sys.argv[1:])
\ No newline at end of file
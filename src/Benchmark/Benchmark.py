@@ -0,0 +1,236 @@
+from ..Game.Board.Board import Board
+from ..Game.Board.Bitboard import iterate_squares, square_to_position
+from ..Game.Board.Perft import PERFT_POSITIONS
+from ..Game.Renderer import BoardRenderer
+from ..Game.Utils import get_opponent_color
+from ..Replay.Replay import play_coordinate_move, REPLAY_ERRORS
+from io import StringIO
+from time import perf_counter
+import platform
+import gc
+import json
+import glob
+import os
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_GAME_PATTERN = os.path.join(REPOSITORY_DIRECTORY,"test","*.txt")
+DEFAULT_RESULTS_PATH = "benchmark.json"
+DEFAULT_THRESHOLD = 10
+DEFAULT_ROUNDS = 5
+
+CONSTRUCTION_ITERATIONS = 2000
+GAME_ITERATIONS = 200
+ATTACK_ITERATIONS = 200
+MOVE_ITERATIONS = 40
+HIGHLIGHT_ITERATIONS = 200
+RENDER_ITERATIONS = 200
+
+class BenchmarkWorkload:
+	def __init__(self,games):
+		self.games = games
+		self.boards = [Board.from_fen(position["fen"]) for position in PERFT_POSITIONS]
+		for game in games:
+			board = Board()
+			for inp in game:
+				play_coordinate_move(board,inp)
+			self.boards.append(board)
+		self.legal_moves = [list(board.legal_moves()) for board in self.boards]
+		self.occupied_positions = [[square_to_position(square) for square in iterate_squares(board.occupancy[board.turn_color])] for board in self.boards]
+
+class BenchmarkResult:
+	def __init__(self,name,operations,seconds):
+		self.name = name
+		self.operations = operations
+		self.seconds = seconds
+
+	def seconds_per_operation(self):
+		if self.operations > 0:
+			return self.seconds/self.operations
+		else:
+			return 0.0
+
+	def to_dict(self):
+		return {
+			"operations": self.operations,
+			"seconds": self.seconds,
+			"seconds_per_operation": self.seconds_per_operation()
+		}
+
+	def __str__(self):
+		return self.name.ljust(30) + str(self.operations).rjust(8) + " ops " + format(1000*self.seconds,".3f").rjust(10) + "ms " + format_microseconds(self.seconds_per_operation()).rjust(11) + "us/op"
+
+def bench_board_construction(workload):
+	for iteration in range(CONSTRUCTION_ITERATIONS):
+		Board()
+	return CONSTRUCTION_ITERATIONS
+
+def bench_scripted_games(workload):
+	moves = 0
+	for iteration in range(GAME_ITERATIONS):
+		for game in workload.games:
+			board = Board()
+			for inp in game:
+				play_coordinate_move(board,inp)
+			moves += len(game)
+	return moves
+
+def bench_attacked_squares_full(workload):
+	for iteration in range(ATTACK_ITERATIONS):
+		for board in workload.boards:
+			board.evaluate_attacked_squares()
+	return ATTACK_ITERATIONS*len(workload.boards)
+
+def bench_attacked_squares_incremental(workload):
+	updates = 0
+	for iteration in range(MOVE_ITERATIONS):
+		for board, moves in zip(workload.boards,workload.legal_moves):
+			for move in moves:
+				board.push(move)
+				board.get_attacked_squares("white")
+				board.pop()
+				board.get_attacked_squares("white")
+			updates += 2*len(moves)
+	return updates
+
+def bench_is_check(workload):
+	checks = 0
+	for iteration in range(MOVE_ITERATIONS):
+		for board, moves in zip(workload.boards,workload.legal_moves):
+			opponent_color = get_opponent_color(board.turn_color)
+			for move in moves:
+				board.push(move)
+				board.is_check(opponent_color)
+				board.pop()
+			checks += len(moves)
+	return checks
+
+def bench_highlight_possible_moves(workload):
+	highlights = 0
+	for iteration in range(HIGHLIGHT_ITERATIONS):
+		for board, positions in zip(workload.boards,workload.occupied_positions):
+			board.clear_check_states()
+			for position in positions:
+				board.highlight_possible_moves(position)
+			board.unhighlight_squares()
+			highlights += len(positions)
+	return highlights
+
+def bench_render(workload,piece_display_type):
+	output = StringIO()
+	renderer = BoardRenderer(piece_display_type,output)
+	for iteration in range(RENDER_ITERATIONS):
+		for board in workload.boards:
+			renderer.render(board)
+		output.seek(0)
+		output.truncate()
+	return RENDER_ITERATIONS*len(workload.boards)
+
+def bench_render_letters(workload):
+	return bench_render(workload,"letters")
+
+def bench_render_pieces(workload):
+	return bench_render(workload,"pieces")
+
+BENCHMARKS = (
+	("board_construction",bench_board_construction),
+	("scripted_games",bench_scripted_games),
+	("attacked_squares_full",bench_attacked_squares_full),
+	("attacked_squares_incremental",bench_attacked_squares_incremental),
+	("is_check",bench_is_check),
+	("highlight_possible_moves",bench_highlight_possible_moves),
+	("render_letters",bench_render_letters),
+	("render_pieces",bench_render_pieces)
+)
+
+def run_benchmark(name,benchmark,workload,rounds):
+	best_seconds = None
+	for round_index in range(rounds):
+		gc.collect()
+		gc_enabled = gc.isenabled()
+		gc.disable()
+		try:
+			start_time = perf_counter()
+			operations = benchmark(workload)
+			elapsed = perf_counter() - start_time
+		finally:
+			if gc_enabled:
+				gc.enable()
+		if best_seconds is None or elapsed < best_seconds:
+			best_seconds = elapsed
+	return BenchmarkResult(name,operations,best_seconds)
+
+def run_benchmark_suite(game_paths=None,output_path=DEFAULT_RESULTS_PATH,baseline_path=None,threshold=DEFAULT_THRESHOLD,rounds=DEFAULT_ROUNDS):
+	baseline = None
+	if baseline_path is not None:
+		try:
+			baseline = load_results(baseline_path)
+		except (OSError,ValueError,KeyError,TypeError):
+			print("Benchmark baseline error. " + baseline_path + " is not a readable benchmark results (.json) file.\n")
+			return False
+
+	if game_paths is None:
+		game_paths = sorted(glob.glob(DEFAULT_GAME_PATTERN))
+	if not game_paths:
+		print("Benchmark game error. No scripted games found at " + DEFAULT_GAME_PATTERN + ".\n")
+		return False
+	try:
+		workload = BenchmarkWorkload([read_game(path) for path in game_paths])
+	except OSError as e:
+		print("Benchmark game error. Cannot read " + str(e.filename) + ".\n")
+		return False
+	except REPLAY_ERRORS:
+		print("Benchmark game error. The scripted games must contain only legal moves in the \"startsquare endsquare\" or \"castle direction\" format.\n")
+		return False
+
+	results = []
+	for name, benchmark in BENCHMARKS:
+		result = run_benchmark(name,benchmark,workload,rounds)
+		print(result)
+		results.append(result)
+
+	write_results(results,output_path,rounds)
+	print("Results written to " + output_path + ".")
+	if baseline is None:
+		return True
+	return compare_results(results,baseline,threshold)
+
+def read_game(path):
+	with open(path) as move_file:
+		return [line.strip() for line in move_file if line.strip()]
+
+def write_results(results,path,rounds):
+	with open(path,"w") as results_file:
+		json.dump({
+			"python": platform.python_version(),
+			"rounds": rounds,
+			"benchmarks": {result.name: result.to_dict() for result in results}
+		},results_file,indent=2)
+
+def load_results(path):
+	with open(path) as results_file:
+		benchmarks = json.load(results_file)["benchmarks"]
+	return {name: (float(benchmarks[name]["seconds_per_operation"]),int(benchmarks[name]["operations"])) for name in benchmarks}
+
+def compare_results(results,baseline,threshold):
+	for result in results:
+		if result.name in baseline and baseline[result.name][1] != result.operations:
+			print("\nBenchmark baseline error. " + result.name + " ran " + str(result.operations) + " operations but the baseline ran " + str(baseline[result.name][1]) + ", so the workloads differ and cannot be compared.\n")
+			return False
+
+	print("\nComparison with baseline (regression threshold " + format(threshold,"g") + "%):")
+	regressions = 0
+	for result in results:
+		baseline_seconds = baseline.get(result.name,(0.0,0))[0]
+		if not baseline_seconds:
+			print(result.name.ljust(30) + " no baseline")
+			continue
+		change = 100*(result.seconds_per_operation()/baseline_seconds - 1)
+		regressed = change > threshold
+		if regressed:
+			regressions += 1
+		print(result.name.ljust(30) + format_microseconds(baseline_seconds).rjust(11) + "us/op -> " + format_microseconds(result.seconds_per_operation()).rjust(11) + "us/op " + format(change,"+.1f").rjust(8) + "% " + ("REGRESSION" if regressed else "ok"))
+	print(str(regressions) + " regression(s).")
+	return regressions == 0
+
+def format_microseconds(seconds):
+	return format(1000000*seconds,".2f")
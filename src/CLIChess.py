@@ -1,14 +1,22 @@
 from .Game.Game import Game
+from .Engine.Search import MAX_DEPTH
 
 class CLIChess:
-	def __init__(self,piece_display_type):
+	def __init__(self,piece_display_type,engine_color=None,engine_depth=MAX_DEPTH,engine_movetime=None,engine_threads=1,book=None,tablebase=None,profiler=None):
 		self.piece_display_type = piece_display_type
+		self.engine_color = engine_color
+		self.engine_depth = engine_depth
+		self.engine_movetime = engine_movetime
+		self.engine_threads = engine_threads
+		self.book = book
+		self.tablebase = tablebase
+		self.profiler = profiler
 
 	def run(self):
 		play = True
 
 		while play:
-			game = Game(self.piece_display_type)
+			game = Game(self.piece_display_type,self.engine_color,self.engine_depth,self.engine_movetime,self.engine_threads,self.book,self.tablebase,self.profiler)
 			game.play()
 
 			while True:
@@ -0,0 +1,125 @@
+from ..Game.Board.Bitboard import COLORS, PIECE_TYPES, RANK_SHIFTS, DIAGONAL_SHIFTS, KNIGHT_SHIFTS, KING_SHIFTS, iterate_squares
+from ..Game.Board.Piece import EMPTY_PIECE_CODE, get_piece_code
+from ..Game.Utils import get_direction
+from .Evaluation import PIECE_VALUES, PIECE_SQUARE_TABLES, KING_ENDGAME_SQUARE_TABLES
+from .EngineErrors import InvalidPositionArrayError
+import numpy as np
+
+PLANE_CODES = tuple(get_piece_code(color,piece_type) for color in COLORS for piece_type in PIECE_TYPES)
+SLIDER_SHIFTS = ((RANK_SHIFTS,("rook","queen")),(DIAGONAL_SHIFTS,("bishop","queen")))
+
+def build_square_values(king_tables):
+	square_values = np.zeros((16,64),dtype=np.int32)
+	for color in COLORS:
+		sign = 1 if color == "white" else -1
+		for piece_type in PIECE_TYPES:
+			table = king_tables[color] if piece_type == "king" else PIECE_SQUARE_TABLES[piece_type][color]
+			square_values[get_piece_code(color,piece_type)] = sign*(np.array(table) + PIECE_VALUES.get(piece_type + "s",0))
+	return square_values
+
+SQUARE_VALUES = build_square_values({color: PIECE_SQUARE_TABLES["king"][color] for color in COLORS})
+ENDGAME_KING_VALUES = build_square_values(KING_ENDGAME_SQUARE_TABLES) - SQUARE_VALUES
+
+def encode_boards(boards):
+	boards = list(boards)
+	codes = np.full((len(boards),64),EMPTY_PIECE_CODE,dtype=np.int8)
+	black_to_move = np.zeros(len(boards),dtype=bool)
+	for index, board in enumerate(boards):
+		for color in COLORS:
+			for piece_type in PIECE_TYPES:
+				code = get_piece_code(color,piece_type)
+				for square in iterate_squares(board.bitboards[color][piece_type]):
+					codes[index,square] = code
+		black_to_move[index] = board.turn_color == "black"
+	return codes, black_to_move
+
+def piece_planes(codes):
+	return codes[:,None,:] == np.array(PLANE_CODES,dtype=np.int8)[None,:,None]
+
+def plane_codes(planes):
+	codes = np.full((planes.shape[0],64),EMPTY_PIECE_CODE,dtype=np.int8)
+	for plane, code in enumerate(PLANE_CODES):
+		codes[planes[:,plane] != 0] = code
+	return codes
+
+def as_piece_codes(positions):
+	positions = np.asarray(positions)
+	if positions.ndim == 3 and positions.shape[1:] == (12,64):
+		return plane_codes(positions)
+	elif positions.ndim == 2 and positions.shape[1] == 64:
+		return positions.astype(np.int8,copy=False)
+	raise InvalidPositionArrayError(positions.shape)
+
+def count_pieces(codes):
+	offsets = 16*np.arange(codes.shape[0])[:,None]
+	return np.bincount((codes + offsets).ravel(),minlength=16*codes.shape[0]).reshape(-1,16)
+
+def find_endgames(counts):
+	endgame = np.ones(counts.shape[0],dtype=bool)
+	for color in COLORS:
+		minor_pieces = counts[:,get_piece_code(color,"knight")] + counts[:,get_piece_code(color,"bishop")]
+		has_queen = counts[:,get_piece_code(color,"queen")] > 0
+		endgame &= ~(has_queen & ((counts[:,get_piece_code(color,"rook")] > 0) | (minor_pieces > 1)))
+	return endgame
+
+def build_shift_mask(file_shift):
+	mask = 0
+	for square in range(64):
+		if 0 <= (square & 7) - file_shift < 8:
+			mask |= 1 << square
+	return np.uint64(mask)
+
+SHIFT_MASKS = {file_shift: build_shift_mask(file_shift) for file_shift in range(-2,3)}
+
+def pack_bitboards(masks):
+	return np.packbits(masks,axis=1,bitorder="little").view("<u8")[:,0]
+
+def shift_bitboards(bitboards,rank_shift,file_shift):
+	amount = rank_shift*8 + file_shift
+	if amount > 0:
+		shifted = bitboards << np.uint64(amount)
+	else:
+		shifted = bitboards >> np.uint64(-amount)
+	return shifted & SHIFT_MASKS[file_shift]
+
+def count_bits(bitboards):
+	return np.unpackbits(np.ascontiguousarray(bitboards).view(np.uint8).reshape(bitboards.shape + (8,)),axis=-1).sum(axis=-1,dtype=np.int32)
+
+def attack_masks(positions):
+	codes = as_piece_codes(positions)
+	empty = pack_bitboards(codes == EMPTY_PIECE_CODE)
+	masks = np.zeros((codes.shape[0],2),dtype=np.uint64)
+	for color_index, color in enumerate(COLORS):
+		pieces = {piece_type: pack_bitboards(codes == get_piece_code(color,piece_type)) for piece_type in PIECE_TYPES}
+		attacks = np.zeros(codes.shape[0],dtype=np.uint64)
+		for shifts, piece_type in ((KNIGHT_SHIFTS,"knight"),(KING_SHIFTS,"king")):
+			for rank_shift, file_shift in shifts:
+				attacks |= shift_bitboards(pieces[piece_type],rank_shift,file_shift)
+		for file_shift in (-1,1):
+			attacks |= shift_bitboards(pieces["pawn"],get_direction(color),file_shift)
+		for shifts, slider_types in SLIDER_SHIFTS:
+			sliders = pieces[slider_types[0]] | pieces[slider_types[1]]
+			for rank_shift, file_shift in shifts:
+				ray = shift_bitboards(sliders,rank_shift,file_shift)
+				for distance in range(6):
+					attacks |= ray
+					ray = shift_bitboards(ray & empty,rank_shift,file_shift)
+				attacks |= ray
+		masks[:,color_index] = attacks
+	return masks
+
+def mobility_counts(positions):
+	return count_bits(attack_masks(positions))
+
+def evaluate_positions(positions,black_to_move=None,mobility_weight=0):
+	codes = as_piece_codes(positions)
+	table_indices = codes.astype(np.intp)*64 + np.arange(64)
+	scores = np.take(SQUARE_VALUES,table_indices).sum(axis=1)
+	endgame = find_endgames(count_pieces(codes))
+	scores[endgame] += np.take(ENDGAME_KING_VALUES,table_indices[endgame]).sum(axis=1)
+	if mobility_weight:
+		mobility = mobility_counts(codes)
+		scores = scores + mobility_weight*(mobility[:,0] - mobility[:,1])
+	if black_to_move is not None:
+		scores = np.where(np.asarray(black_to_move,dtype=bool),-scores,scores)
+	return scores
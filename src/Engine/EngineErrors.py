@@ -0,0 +1,15 @@
+class SearchTimeoutError(Exception):
+	def __init__(self,nodes):
+		self.nodes = nodes
+
+class InvalidBookError(Exception):
+	def __init__(self,path):
+		self.path = path
+
+class InvalidTablebaseError(Exception):
+	def __init__(self,path):
+		self.path = path
+
+class InvalidPositionArrayError(Exception):
+	def __init__(self,shape):
+		self.shape = shape
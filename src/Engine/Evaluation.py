@@ -0,0 +1,137 @@
+from ..Game.Board.Bitboard import COLORS, PIECE_TYPES, iterate_squares
+from ..Game.Utils import get_opponent_color
+
+PIECE_VALUES = {
+	"pawns": 100,
+	"knights": 320,
+	"bishops": 330,
+	"rooks": 500,
+	"queens": 900
+}
+PIECE_TYPE_VALUES = {
+	"pawn": 100,
+	"knight": 320,
+	"bishop": 330,
+	"rook": 500,
+	"queen": 900,
+	"king": 20000
+}
+
+PAWN_TABLE = [
+	 0,  0,  0,  0,  0,  0,  0,  0,
+	50, 50, 50, 50, 50, 50, 50, 50,
+	10, 10, 20, 30, 30, 20, 10, 10,
+	 5,  5, 10, 25, 25, 10,  5,  5,
+	 0,  0,  0, 20, 20,  0,  0,  0,
+	 5, -5,-10,  0,  0,-10, -5,  5,
+	 5, 10, 10,-20,-20, 10, 10,  5,
+	 0,  0,  0,  0,  0,  0,  0,  0
+]
+KNIGHT_TABLE = [
+	-50,-40,-30,-30,-30,-30,-40,-50,
+	-40,-20,  0,  0,  0,  0,-20,-40,
+	-30,  0, 10, 15, 15, 10,  0,-30,
+	-30,  5, 15, 20, 20, 15,  5,-30,
+	-30,  0, 15, 20, 20, 15,  0,-30,
+	-30,  5, 10, 15, 15, 10,  5,-30,
+	-40,-20,  0,  5,  5,  0,-20,-40,
+	-50,-40,-30,-30,-30,-30,-40,-50
+]
+BISHOP_TABLE = [
+	-20,-10,-10,-10,-10,-10,-10,-20,
+	-10,  0,  0,  0,  0,  0,  0,-10,
+	-10,  0,  5, 10, 10,  5,  0,-10,
+	-10,  5,  5, 10, 10,  5,  5,-10,
+	-10,  0, 10, 10, 10, 10,  0,-10,
+	-10, 10, 10, 10, 10, 10, 10,-10,
+	-10,  5,  0,  0,  0,  0,  5,-10,
+	-20,-10,-10,-10,-10,-10,-10,-20
+]
+ROOK_TABLE = [
+	 0,  0,  0,  0,  0,  0,  0,  0,
+	 5, 10, 10, 10, 10, 10, 10,  5,
+	-5,  0,  0,  0,  0,  0,  0, -5,
+	-5,  0,  0,  0,  0,  0,  0, -5,
+	-5,  0,  0,  0,  0,  0,  0, -5,
+	-5,  0,  0,  0,  0,  0,  0, -5,
+	-5,  0,  0,  0,  0,  0,  0, -5,
+	 0,  0,  0,  5,  5,  0,  0,  0
+]
+QUEEN_TABLE = [
+	-20,-10,-10, -5, -5,-10,-10,-20,
+	-10,  0,  0,  0,  0,  0,  0,-10,
+	-10,  0,  5,  5,  5,  5,  0,-10,
+	 -5,  0,  5,  5,  5,  5,  0, -5,
+	  0,  0,  5,  5,  5,  5,  0, -5,
+	-10,  5,  5,  5,  5,  5,  0,-10,
+	-10,  0,  5,  0,  0,  0,  0,-10,
+	-20,-10,-10, -5, -5,-10,-10,-20
+]
+KING_TABLE = [
+	-30,-40,-40,-50,-50,-40,-40,-30,
+	-30,-40,-40,-50,-50,-40,-40,-30,
+	-30,-40,-40,-50,-50,-40,-40,-30,
+	-30,-40,-40,-50,-50,-40,-40,-30,
+	-20,-30,-30,-40,-40,-30,-30,-20,
+	-10,-20,-20,-20,-20,-20,-20,-10,
+	 20, 20,  0,  0,  0,  0, 20, 20,
+	 20, 30, 10,  0,  0, 10, 30, 20
+]
+KING_ENDGAME_TABLE = [
+	-50,-40,-30,-20,-20,-30,-40,-50,
+	-30,-20,-10,  0,  0,-10,-20,-30,
+	-30,-10, 20, 30, 30, 20,-10,-30,
+	-30,-10, 30, 40, 40, 30,-10,-30,
+	-30,-10, 30, 40, 40, 30,-10,-30,
+	-30,-10, 20, 30, 30, 20,-10,-30,
+	-30,-30,  0,  0,  0,  0,-30,-30,
+	-50,-30,-30,-30,-30,-30,-30,-50
+]
+PIECE_TABLES = {
+	"pawn": PAWN_TABLE,
+	"knight": KNIGHT_TABLE,
+	"bishop": BISHOP_TABLE,
+	"rook": ROOK_TABLE,
+	"queen": QUEEN_TABLE,
+	"king": KING_TABLE
+}
+
+def build_piece_square_tables(table):
+	return {
+		"white": [table[square ^ 56] for square in range(64)],
+		"black": [table[square] for square in range(64)]
+	}
+
+PIECE_SQUARE_TABLES = {}
+for piece_type in PIECE_TYPES:
+	PIECE_SQUARE_TABLES[piece_type] = build_piece_square_tables(PIECE_TABLES[piece_type])
+KING_ENDGAME_SQUARE_TABLES = build_piece_square_tables(KING_ENDGAME_TABLE)
+
+def evaluate_material(pieces,color):
+	material = 0
+	for piece_kind, value in PIECE_VALUES.items():
+		material += value*pieces[color][piece_kind]
+	return material
+
+def is_endgame(pieces):
+	for color in COLORS:
+		minor_pieces = pieces[color]["knights"] + pieces[color]["bishops"]
+		if pieces[color]["queens"] > 0 and (pieces[color]["rooks"] > 0 or minor_pieces > 1):
+			return False
+	return True
+
+def evaluate_color(board,color,endgame):
+	score = evaluate_material(board.pieces,color)
+	for piece_type in PIECE_TYPES:
+		if piece_type == "king" and endgame:
+			table = KING_ENDGAME_SQUARE_TABLES[color]
+		else:
+			table = PIECE_SQUARE_TABLES[piece_type][color]
+		for square in iterate_squares(board.bitboards[color][piece_type]):
+			score += table[square]
+	return score
+
+def evaluate(board):
+	turn_color = board.turn_color
+	endgame = is_endgame(board.pieces)
+	return evaluate_color(board,turn_color,endgame) - evaluate_color(board,get_opponent_color(turn_color),endgame)
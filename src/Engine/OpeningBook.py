@@ -0,0 +1,72 @@
+from ..Game.Board.Move import Move
+from ..Game.Board.Bitboard import square_index, square_rank, square_file
+from .EngineErrors import InvalidBookError
+from random import choices
+import struct
+import mmap
+import os
+
+BOOK_ENTRY = struct.Struct(">QHHI")
+BOOK_KEY = struct.Struct(">Q")
+BOOK_PROMOTION_TYPES = (None,"knight","bishop","rook","queen")
+
+class OpeningBook:
+	def __init__(self,path):
+		self.path = path
+		with open(path,"rb") as book_file:
+			book_size = os.fstat(book_file.fileno()).st_size
+			if book_size == 0 or book_size % BOOK_ENTRY.size != 0:
+				raise InvalidBookError(path)
+			self.buffer = mmap.mmap(book_file.fileno(),0,access=mmap.ACCESS_READ)
+		self.entry_count = len(self.buffer) // BOOK_ENTRY.size
+
+	def find_first_entry(self,key):
+		low = 0
+		high = self.entry_count
+		while low < high:
+			middle = (low + high) // 2
+			if BOOK_KEY.unpack_from(self.buffer,middle*BOOK_ENTRY.size)[0] < key:
+				low = middle + 1
+			else:
+				high = middle
+		return low
+
+	def find_moves(self,board):
+		key = board.hash
+		moves = []
+		for index in range(self.find_first_entry(key),self.entry_count):
+			entry_key, encoded_move, weight, learn = BOOK_ENTRY.unpack_from(self.buffer,index*BOOK_ENTRY.size)
+			if entry_key != key:
+				break
+			move = decode_book_move(board,encoded_move)
+			if move is not None:
+				moves.append((move,weight))
+		return moves
+
+	def choose_move(self,board):
+		legal_moves = set(board.legal_moves())
+		candidates = [(move,weight) for move, weight in self.find_moves(board) if move in legal_moves and weight > 0]
+		if not candidates:
+			return None
+		return choices([move for move, weight in candidates],[weight for move, weight in candidates])[0]
+
+	def close(self):
+		self.buffer.close()
+
+def decode_book_move(board,encoded_move):
+	end = square_index((encoded_move >> 3) & 7,encoded_move & 7)
+	start = square_index((encoded_move >> 9) & 7,(encoded_move >> 6) & 7)
+	promotion_code = (encoded_move >> 12) & 7
+	if promotion_code >= len(BOOK_PROMOTION_TYPES):
+		return None
+	if board.piece_type_at(start,board.turn_color) == "king" and square_file(start) == 4 and square_rank(end) == square_rank(start) and square_file(end) in (0,7):
+		end = square_index(square_rank(start),6 if square_file(end) == 7 else 2)
+	return Move(start,end,BOOK_PROMOTION_TYPES[promotion_code])
+
+def format_book_moves(book_moves):
+	total_weight = sum(weight for move, weight in book_moves)
+	descriptions = []
+	for move, weight in sorted(book_moves,key=lambda book_move: -book_move[1]):
+		share = 100*weight//total_weight if total_weight > 0 else 0
+		descriptions.append(str(move) + " (" + str(share) + "%)")
+	return ", ".join(descriptions)
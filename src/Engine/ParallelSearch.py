@@ -0,0 +1,65 @@
+from .Search import Search, MAX_DEPTH
+from .SharedTranspositionTable import SharedTranspositionTable
+from .TranspositionTable import DEFAULT_TABLE_SIZE
+from multiprocessing import Process, Queue, Event
+import pickle
+
+class ParallelSearch:
+	def __init__(self,board,threads,table_size=DEFAULT_TABLE_SIZE):
+		self.board = board
+		self.threads = threads
+		self.transposition_table = SharedTranspositionTable(table_size)
+		self.stop_event = Event()
+		self.main_search = Search(board,self.transposition_table)
+		self.result_queue = Queue()
+		self.task_queues = []
+		self.workers = []
+		for helper_index in range(threads-1):
+			task_queue = Queue()
+			worker = Process(target=run_helper,args=(helper_index,self.transposition_table.shared_array,table_size,task_queue,self.result_queue,self.stop_event),daemon=True)
+			worker.start()
+			self.task_queues.append(task_queue)
+			self.workers.append(worker)
+
+	def search(self,max_depth=MAX_DEPTH,movetime=None,report=None):
+		self.stop_event.clear()
+		self.board.board_view = None
+		snapshot = pickle.dumps(self.board)
+		for task_queue in self.task_queues:
+			task_queue.put((snapshot,max_depth))
+
+		try:
+			result = self.main_search.search(max_depth,movetime,report)
+		finally:
+			self.stop_event.set()
+			helper_nodes = 0
+			for task_queue in self.task_queues:
+				helper_nodes += self.result_queue.get()
+
+		result.nodes += helper_nodes
+		return result
+
+	def stop(self):
+		self.main_search.stop()
+		self.stop_event.set()
+
+	def close(self):
+		for task_queue in self.task_queues:
+			task_queue.put(None)
+		for worker in self.workers:
+			worker.join()
+		self.task_queues = []
+		self.workers = []
+
+def run_helper(helper_index,shared_array,table_size,task_queue,result_queue,stop_event):
+	transposition_table = SharedTranspositionTable(table_size,shared_array)
+	while True:
+		task = task_queue.get()
+		if task is None:
+			break
+		snapshot, max_depth = task
+		search = Search(pickle.loads(snapshot),transposition_table,stop_event)
+		search.search(max_depth,start_depth=1 + helper_index % 2)
+		if not stop_event.is_set():
+			stop_event.wait()
+		result_queue.put(search.nodes)
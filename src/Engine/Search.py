@@ -0,0 +1,287 @@
+from ..Game.Utils import get_opponent_color
+from .Evaluation import evaluate, PIECE_TYPE_VALUES
+from .TranspositionTable import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from .EngineErrors import SearchTimeoutError
+from .Tablebase import DRAW_VALUE
+from time import perf_counter
+
+MATE_SCORE = 100000
+MATE_BOUND = MATE_SCORE - 1000
+INFINITY = 1000000
+MAX_DEPTH = 64
+MAX_PLY = 128
+CHECK_INTERVAL = 1024
+
+TT_MOVE_ORDER = 10000000
+CAPTURE_ORDER = 1000000
+PROMOTION_ORDER = 900000
+KILLER_ORDER = 800000
+
+class SearchResult:
+	def __init__(self,move,score,depth,nodes,elapsed):
+		self.move = move
+		self.score = score
+		self.depth = depth
+		self.nodes = nodes
+		self.elapsed = elapsed
+
+	def nodes_per_second(self):
+		if self.elapsed > 0:
+			return int(self.nodes/self.elapsed)
+		else:
+			return 0
+
+	def __str__(self):
+		return "depth " + str(self.depth) + ", score " + format_score(self.score) + ", " + str(self.nodes) + " nodes, " + str(self.nodes_per_second()) + " nodes/s"
+
+class Search:
+	def __init__(self,board,transposition_table=None,stop_event=None):
+		self.board = board
+		self.stop_event = stop_event
+		if transposition_table is None:
+			transposition_table = TranspositionTable()
+		self.transposition_table = transposition_table
+		self.killers = [[None,None] for ply in range(MAX_PLY)]
+		self.history = {}
+		self.nodes = 0
+		self.deadline = None
+		self.stop_requested = False
+
+	def stop(self):
+		self.stop_requested = True
+
+	def set_movetime(self,movetime):
+		self.deadline = perf_counter() + movetime/1000
+
+	def search(self,max_depth=MAX_DEPTH,movetime=None,report=None,start_depth=1):
+		start_time = perf_counter()
+		self.deadline = None
+		if movetime is not None:
+			self.deadline = start_time + movetime/1000
+		self.nodes = 0
+		self.stop_requested = False
+		self.killers = [[None,None] for ply in range(MAX_PLY)]
+		root_stack_size = len(self.board.move_stack)
+
+		result = SearchResult(None,0,0,0,0.0)
+		for depth in range(min(start_depth,max_depth),max_depth+1):
+			try:
+				score, move = self.search_root(depth)
+			except SearchTimeoutError:
+				while len(self.board.move_stack) > root_stack_size:
+					self.board.pop()
+				break
+			result = SearchResult(move,score,depth,self.nodes,perf_counter()-start_time)
+			if report is not None:
+				report(result)
+			if move is None or abs(score) >= MATE_BOUND:
+				break
+
+		if result.move is None:
+			for move in self.board.legal_moves():
+				result.move = move
+				break
+		result.nodes = self.nodes
+		result.elapsed = perf_counter() - start_time
+		return result
+
+	def search_root(self,depth):
+		board = self.board
+		turn_color = board.turn_color
+		opponent_color = get_opponent_color(turn_color)
+		alpha = -INFINITY
+		beta = INFINITY
+		best_move = None
+		best_score = -INFINITY
+
+		entry = self.transposition_table.probe(board.hash)
+		tt_move = entry[4] if entry is not None else None
+		for move in self.order_moves(board.pseudo_legal_moves(turn_color),tt_move,0,turn_color):
+			board.push(move)
+			if board.is_check(opponent_color):
+				board.pop()
+				continue
+			score = -self.negamax(depth-1,-beta,-alpha,1)
+			board.pop()
+			if score > best_score:
+				best_score = score
+				best_move = move
+			if score > alpha:
+				alpha = score
+
+		if best_move is None:
+			if board.is_check(opponent_color):
+				return -MATE_SCORE, None
+			return 0, None
+		self.transposition_table.store(board.hash,depth,best_score,EXACT,best_move)
+		return best_score, best_move
+
+	def negamax(self,depth,alpha,beta,ply):
+		board = self.board
+		self.count_node()
+
+		if board.repetition_count() >= 2 or board.is_fifty_move_no_cap():
+			return 0
+		if board.tablebase is not None:
+			value = board.tablebase.probe(board)
+			if value is not None:
+				return tablebase_score(value,ply)
+
+		turn_color = board.turn_color
+		opponent_color = get_opponent_color(turn_color)
+		in_check = board.is_check(opponent_color)
+		if depth <= 0:
+			if in_check:
+				depth = 1
+			else:
+				return self.quiescence(alpha,beta,ply)
+
+		original_alpha = alpha
+		tt_move = None
+		entry = self.transposition_table.probe(board.hash)
+		if entry is not None:
+			tt_move = entry[4]
+			if entry[1] >= depth:
+				score = score_from_table(entry[2],ply)
+				if entry[3] == EXACT:
+					return score
+				elif entry[3] == LOWER_BOUND and score > alpha:
+					alpha = score
+				elif entry[3] == UPPER_BOUND and score < beta:
+					beta = score
+				if alpha >= beta:
+					return score
+
+		best_score = -INFINITY
+		best_move = None
+		for move in self.order_moves(board.pseudo_legal_moves(turn_color),tt_move,ply,turn_color):
+			is_quiet = board.piece_at(move.end) is None and move.promotion_type is None
+			board.push(move)
+			if board.is_check(opponent_color):
+				board.pop()
+				continue
+			score = -self.negamax(depth-1,-beta,-alpha,ply+1)
+			board.pop()
+
+			if score > best_score:
+				best_score = score
+				best_move = move
+			if score > alpha:
+				alpha = score
+			if alpha >= beta:
+				if is_quiet:
+					self.update_quiet_move(move,depth,ply,turn_color)
+				break
+
+		if best_move is None:
+			if in_check:
+				return -MATE_SCORE + ply
+			return 0
+
+		if best_score <= original_alpha:
+			flag = UPPER_BOUND
+		elif best_score >= beta:
+			flag = LOWER_BOUND
+		else:
+			flag = EXACT
+		self.transposition_table.store(board.hash,depth,score_to_table(best_score,ply),flag,best_move)
+		return best_score
+
+	def quiescence(self,alpha,beta,ply):
+		board = self.board
+		self.count_node()
+
+		stand_pat = evaluate(board)
+		if stand_pat >= beta:
+			return stand_pat
+		if stand_pat > alpha:
+			alpha = stand_pat
+
+		turn_color = board.turn_color
+		opponent_color = get_opponent_color(turn_color)
+		for move in self.order_moves(board.pseudo_legal_captures(turn_color),None,ply,turn_color):
+			board.push(move)
+			if board.is_check(opponent_color):
+				board.pop()
+				continue
+			score = -self.quiescence(-beta,-alpha,ply+1)
+			board.pop()
+
+			if score >= beta:
+				return score
+			if score > alpha:
+				alpha = score
+		return alpha
+
+	def order_moves(self,moves,tt_move,ply,turn_color):
+		board = self.board
+		opponent_color = get_opponent_color(turn_color)
+		killers = self.killers[min(ply,MAX_PLY-1)]
+		scored_moves = []
+		for move in moves:
+			if move == tt_move:
+				order = TT_MOVE_ORDER
+			else:
+				victim_type = board.piece_type_at(move.end,opponent_color)
+				if victim_type is None and move.end == board.en_passant_square and board.piece_type_at(move.start,turn_color) == "pawn":
+					victim_type = "pawn"
+				if victim_type is not None:
+					order = CAPTURE_ORDER + 10*PIECE_TYPE_VALUES[victim_type] - PIECE_TYPE_VALUES[board.piece_type_at(move.start,turn_color)]//100
+				elif move.promotion_type is not None:
+					order = PROMOTION_ORDER + PIECE_TYPE_VALUES[move.promotion_type]
+				elif move == killers[0]:
+					order = KILLER_ORDER
+				elif move == killers[1]:
+					order = KILLER_ORDER - 1
+				else:
+					order = self.history.get((turn_color,move.start,move.end),0)
+			scored_moves.append((order,move))
+		scored_moves.sort(key=lambda scored_move: scored_move[0],reverse=True)
+		return [move for order, move in scored_moves]
+
+	def update_quiet_move(self,move,depth,ply,turn_color):
+		killers = self.killers[min(ply,MAX_PLY-1)]
+		if move != killers[0]:
+			killers[1] = killers[0]
+			killers[0] = move
+		history_key = (turn_color,move.start,move.end)
+		self.history[history_key] = min(self.history.get(history_key,0) + depth*depth,KILLER_ORDER - 2)
+
+	def close(self):
+		pass
+
+	def count_node(self):
+		self.nodes += 1
+		if self.stop_requested:
+			raise SearchTimeoutError(self.nodes)
+		if self.nodes % CHECK_INTERVAL == 0:
+			if (self.stop_event is not None and self.stop_event.is_set()) or (self.deadline is not None and perf_counter() >= self.deadline):
+				raise SearchTimeoutError(self.nodes)
+
+def score_to_table(score,ply):
+	if score >= MATE_BOUND:
+		return score + ply
+	elif score <= -MATE_BOUND:
+		return score - ply
+	return score
+
+def score_from_table(score,ply):
+	if score >= MATE_BOUND:
+		return score - ply
+	elif score <= -MATE_BOUND:
+		return score + ply
+	return score
+
+def tablebase_score(value,ply):
+	if value == DRAW_VALUE:
+		return 0
+	elif value % 2 == 1:
+		return MATE_SCORE - ply - value
+	return -MATE_SCORE + ply + value
+
+def format_score(score):
+	if score >= MATE_BOUND:
+		return "mate in " + str((MATE_SCORE - score + 1)//2)
+	elif score <= -MATE_BOUND:
+		return "mated in " + str((MATE_SCORE + score)//2)
+	return str(score)
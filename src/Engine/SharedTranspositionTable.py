@@ -0,0 +1,36 @@
+from ..Game.Board.Move import Move
+from .TranspositionTable import DEFAULT_TABLE_SIZE
+from multiprocessing import RawArray
+from ctypes import memset, addressof, sizeof
+
+SCORE_OFFSET = 1 << 31
+
+class SharedTranspositionTable:
+	def __init__(self,size=DEFAULT_TABLE_SIZE,shared_array=None):
+		self.size = size
+		if shared_array is None:
+			shared_array = RawArray("Q",2*size)
+		self.shared_array = shared_array
+		self.slots = memoryview(shared_array).cast("B").cast("Q")
+
+	def probe(self,key):
+		index = 2*(key % self.size)
+		data = self.slots[index+1]
+		if data and self.slots[index] ^ data == key:
+			encoded_move = data & 0xFFFF
+			move = Move.from_int(encoded_move) if encoded_move else None
+			return (key,(data >> 48) & 0xFF,((data >> 16) & 0xFFFFFFFF) - SCORE_OFFSET,data >> 56,move)
+		return None
+
+	def store(self,key,depth,score,flag,move):
+		index = 2*(key % self.size)
+		stored_data = self.slots[index+1]
+		if stored_data and self.slots[index] ^ stored_data == key and depth < (stored_data >> 48) & 0xFF:
+			return
+		encoded_move = move.to_int() if move is not None else 0
+		data = encoded_move | ((score + SCORE_OFFSET) << 16) | (min(depth,0xFF) << 48) | (flag << 56)
+		self.slots[index] = key ^ data
+		self.slots[index+1] = data
+
+	def clear(self):
+		memset(addressof(self.shared_array),0,sizeof(self.shared_array))
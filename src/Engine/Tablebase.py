@@ -0,0 +1,213 @@
+from ..Game.Board.Bitboard import COLORS, iterate_squares
+from ..Game.Utils import get_opponent_color
+from .EngineErrors import InvalidTablebaseError
+import struct
+import mmap
+import os
+
+DEFAULT_TABLEBASE_DIRECTORY = "tablebases"
+TABLEBASE_EXTENSION = ".tb"
+TABLEBASE_MAGIC = b"CLTB"
+TABLEBASE_VERSION = 1
+TABLEBASE_HEADER = struct.Struct("<4sBBH")
+MAX_PIECES = 4
+
+ILLEGAL_VALUE = 254
+DRAW_VALUE = 255
+
+SIGNATURE_LETTERS = {
+	"king": "K",
+	"queen": "Q",
+	"rook": "R",
+	"bishop": "B",
+	"knight": "N",
+	"pawn": "P"
+}
+SIGNATURE_TYPES = {letter: piece_type for piece_type, letter in SIGNATURE_LETTERS.items()}
+SIGNATURE_ORDER = "KQRBNP"
+
+TRANSFORMS = (
+	lambda rank, file: (rank,file),
+	lambda rank, file: (rank,7-file),
+	lambda rank, file: (7-rank,file),
+	lambda rank, file: (7-rank,7-file),
+	lambda rank, file: (file,rank),
+	lambda rank, file: (file,7-rank),
+	lambda rank, file: (7-file,rank),
+	lambda rank, file: (7-file,7-rank)
+)
+TRANSFORM_TABLES = tuple(tuple(transform(square >> 3,square & 7)[0]*8 + transform(square >> 3,square & 7)[1] for square in range(64)) for transform in TRANSFORMS)
+PAWNLESS_REGION = tuple(square for square in range(64) if (square & 7) <= 3 and (square >> 3) <= (square & 7))
+PAWN_REGION = tuple(square for square in range(64) if (square & 7) <= 3)
+
+def find_king_transforms(region,transform_count):
+	king_transforms = []
+	for square in range(64):
+		for transform_index in range(transform_count):
+			if TRANSFORM_TABLES[transform_index][square] in region:
+				king_transforms.append(transform_index)
+				break
+	return tuple(king_transforms)
+
+PAWNLESS_KING_TRANSFORMS = find_king_transforms(PAWNLESS_REGION,8)
+PAWN_KING_TRANSFORMS = find_king_transforms(PAWN_REGION,2)
+
+class TablebaseLayout:
+	def __init__(self,signature):
+		self.signature = signature
+		self.pieces = signature_pieces(signature)
+		self.piece_count = len(self.pieces)
+		self.has_pawns = "P" in signature
+		if self.has_pawns:
+			self.region = PAWN_REGION
+			self.king_transforms = PAWN_KING_TRANSFORMS
+		else:
+			self.region = PAWNLESS_REGION
+			self.king_transforms = PAWNLESS_KING_TRANSFORMS
+		self.region_indices = [None]*64
+		for region_index, square in enumerate(self.region):
+			self.region_indices[square] = region_index
+		self.positions_per_side = len(self.region)*64**(self.piece_count-1)
+		self.size = 2*self.positions_per_side
+
+	def index(self,stm,squares):
+		transform = TRANSFORM_TABLES[self.king_transforms[squares[0]]]
+		index = stm*len(self.region) + self.region_indices[transform[squares[0]]]
+		for square in squares[1:]:
+			index = index*64 + transform[square]
+		return index
+
+class TablebaseFile:
+	def __init__(self,path,layout):
+		self.path = path
+		self.layout = layout
+		with open(path,"rb") as table_file:
+			self.buffer = mmap.mmap(table_file.fileno(),0,access=mmap.ACCESS_READ)
+		magic, version, piece_count, reserved = TABLEBASE_HEADER.unpack_from(self.buffer,0)
+		if magic != TABLEBASE_MAGIC or version != TABLEBASE_VERSION or piece_count != layout.piece_count or len(self.buffer) != TABLEBASE_HEADER.size + layout.size:
+			self.buffer.close()
+			raise InvalidTablebaseError(path)
+
+	def value(self,index):
+		return self.buffer[TABLEBASE_HEADER.size + index]
+
+	def close(self):
+		self.buffer.close()
+
+class Tablebase:
+	def __init__(self,directory=DEFAULT_TABLEBASE_DIRECTORY):
+		self.directory = directory
+		self.tables = {}
+		self.max_pieces = 0
+		if os.path.isdir(directory):
+			for file_name in os.listdir(directory):
+				if file_name.endswith(TABLEBASE_EXTENSION):
+					self.max_pieces = max(self.max_pieces,len(file_name) - len(TABLEBASE_EXTENSION) - 1)
+
+	def __getstate__(self):
+		return {"directory": self.directory}
+
+	def __setstate__(self,state):
+		self.__init__(state["directory"])
+
+	def get_table(self,signature):
+		if signature not in self.tables:
+			path = tablebase_path(self.directory,signature)
+			self.tables[signature] = TablebaseFile(path,TablebaseLayout(signature)) if os.path.isfile(path) else None
+		return self.tables[signature]
+
+	def probe(self,board):
+		if (board.occupancy["white"] | board.occupancy["black"]).bit_count() > self.max_pieces:
+			return None
+		if board.en_passant_hash() != 0:
+			return None
+		for color in COLORS:
+			if board.castling_rights[color]["short"] or board.castling_rights[color]["long"]:
+				return None
+
+		signature, swapped = canonical_signature(board_letters(board,"white"),board_letters(board,"black"))
+		table = self.get_table(signature)
+		if table is None:
+			return None
+		squares = board_squares(board,table.layout.pieces,swapped)
+		stm = 0 if board.turn_color == "white" else 1
+		if swapped:
+			stm = 1 - stm
+		value = table.value(table.layout.index(stm,squares))
+		return value if value != ILLEGAL_VALUE else None
+
+	def is_draw(self,board):
+		return self.probe(board) == DRAW_VALUE
+
+	def winner(self,board):
+		value = self.probe(board)
+		if is_tablebase_win(value):
+			return board.turn_color
+		elif is_tablebase_loss(value):
+			return get_opponent_color(board.turn_color)
+		return None
+
+	def close(self):
+		for table in self.tables.values():
+			if table is not None:
+				table.close()
+		self.tables = {}
+
+def tablebase_path(directory,signature):
+	return os.path.join(directory,signature + TABLEBASE_EXTENSION)
+
+def parse_signature(signature):
+	sides = signature.upper().split("V")
+	if len(sides) != 2:
+		return None
+	for side in sides:
+		if not side.startswith("K") or side.count("K") != 1 or any(letter not in SIGNATURE_ORDER for letter in side):
+			return None
+	if len(sides[0]) + len(sides[1]) > MAX_PIECES:
+		return None
+	return canonical_signature(sides[0],sides[1])[0]
+
+def sort_letters(letters):
+	return "".join(sorted(letters,key=SIGNATURE_ORDER.index))
+
+def canonical_signature(white_letters,black_letters):
+	white_letters = sort_letters(white_letters)
+	black_letters = sort_letters(black_letters)
+	white_key = (len(white_letters),[-SIGNATURE_ORDER.index(letter) for letter in white_letters])
+	black_key = (len(black_letters),[-SIGNATURE_ORDER.index(letter) for letter in black_letters])
+	if black_key > white_key:
+		return black_letters + "v" + white_letters, True
+	return white_letters + "v" + black_letters, False
+
+def signature_pieces(signature):
+	white_letters, black_letters = signature.split("v")
+	pieces = [("white","king"),("black","king")]
+	pieces += [("white",SIGNATURE_TYPES[letter]) for letter in white_letters[1:]]
+	pieces += [("black",SIGNATURE_TYPES[letter]) for letter in black_letters[1:]]
+	return pieces
+
+def pieces_letters(pieces,color):
+	return "".join(SIGNATURE_LETTERS[piece_type] for piece_color, piece_type in pieces if piece_color == color)
+
+def board_letters(board,color):
+	letters = ""
+	for piece_type, letter in SIGNATURE_LETTERS.items():
+		letters += letter*board.bitboards[color][piece_type].bit_count()
+	return letters
+
+def board_squares(board,pieces,swapped):
+	remaining = {}
+	squares = []
+	for color, piece_type in pieces:
+		board_color = get_opponent_color(color) if swapped else color
+		if (board_color,piece_type) not in remaining:
+			remaining[(board_color,piece_type)] = iterate_squares(board.bitboards[board_color][piece_type])
+		square = next(remaining[(board_color,piece_type)])
+		squares.append(square ^ 56 if swapped else square)
+	return squares
+
+def is_tablebase_win(value):
+	return value is not None and value < ILLEGAL_VALUE and value % 2 == 1
+
+def is_tablebase_loss(value):
+	return value is not None and value < ILLEGAL_VALUE and value % 2 == 0
@@ -0,0 +1,405 @@
+from ..Game.Board.Bitboard import COLORS, RANK_SHIFTS, DIAGONAL_SHIFTS, KNIGHT_SHIFTS, KING_SHIFTS
+from ..Game.Board.AttackTables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS
+from ..Game.Utils import get_opponent_color, get_direction, get_pawn_rank
+from .Tablebase import DEFAULT_TABLEBASE_DIRECTORY, TablebaseLayout, TRANSFORM_TABLES, TABLEBASE_HEADER, TABLEBASE_MAGIC, TABLEBASE_VERSION, ILLEGAL_VALUE, DRAW_VALUE, MAX_PIECES, canonical_signature, pieces_letters, tablebase_path
+from .EngineErrors import InvalidTablebaseError
+from itertools import combinations_with_replacement
+from time import perf_counter
+import numpy as np
+import os
+
+UNKNOWN_VALUE = 253
+NO_EXIT = 255
+FRONTIER_CHUNK_SIZE = 1 << 18
+PROMOTION_TYPES = ("queen","rook","bishop","knight")
+SQUARES = np.arange(64)
+
+class MoveSlot:
+	__slots__ = ("dest","check_path","mode","promotes")
+
+	def __init__(self,dest,check_path,mode="any",promotes=None):
+		self.dest = dest
+		self.check_path = check_path
+		self.mode = mode
+		self.promotes = promotes
+
+def shift_squares(rank_shift,file_shift,origins=range(64)):
+	dest = np.full(64,-1,dtype=np.int64)
+	for square in origins:
+		rank = (square >> 3) + rank_shift
+		file = (square & 7) + file_shift
+		if 0 <= rank < 8 and 0 <= file < 8:
+			dest[square] = rank*8 + file
+	return dest
+
+def build_piece_slots(shifts,slide):
+	slots = []
+	for rank_shift, file_shift in shifts:
+		for distance in range(1,8 if slide else 2):
+			dest = shift_squares(rank_shift*distance,file_shift*distance)
+			if (dest >= 0).any():
+				slots.append(MoveSlot(dest,distance > 1))
+	return slots
+
+def build_pawn_slots(color):
+	direction = get_direction(color)
+	pawn_ranks = range(8,56)
+	start_rank = get_pawn_rank(color)
+	last_rank = 7 if color == "white" else 0
+	promotes = np.array([(square >> 3) + direction == last_rank for square in range(64)])
+	return [
+		MoveSlot(shift_squares(direction,0,pawn_ranks),False,"quiet",promotes),
+		MoveSlot(shift_squares(2*direction,0,range(start_rank*8,start_rank*8+8)),True,"quiet",promotes),
+		MoveSlot(shift_squares(direction,-1,pawn_ranks),False,"capture",promotes),
+		MoveSlot(shift_squares(direction,1,pawn_ranks),False,"capture",promotes)
+	]
+
+def build_pawn_unmove_slots(color):
+	direction = get_direction(color)
+	double_push_rank = get_pawn_rank(color) + 2*direction
+	return [
+		MoveSlot(shift_squares(-direction,0),False),
+		MoveSlot(shift_squares(-2*direction,0,range(double_push_rank*8,double_push_rank*8+8)),True)
+	]
+
+def build_between_table():
+	between = np.zeros((64,64,64),dtype=bool)
+	for square in range(64):
+		for rank_shift, file_shift in RANK_SHIFTS + DIAGONAL_SHIFTS:
+			path = []
+			rank = square >> 3
+			file = square & 7
+			while True:
+				rank += rank_shift
+				file += file_shift
+				if not (0 <= rank < 8 and 0 <= file < 8):
+					break
+				between[square,rank*8 + file,path] = True
+				path.append(rank*8 + file)
+	return between
+
+def bitboard_table(attacks):
+	return np.array([[(attacks[square] >> target) & 1 == 1 for target in range(64)] for square in range(64)])
+
+BETWEEN = build_between_table()
+RANKS = SQUARES >> 3
+FILES = SQUARES & 7
+LINES = {
+	"rook": ((RANKS[:,None] == RANKS[None,:]) | (FILES[:,None] == FILES[None,:])) & (SQUARES[:,None] != SQUARES[None,:]),
+	"bishop": (np.abs(RANKS[:,None] - RANKS[None,:]) == np.abs(FILES[:,None] - FILES[None,:])) & (SQUARES[:,None] != SQUARES[None,:])
+}
+LINES["queen"] = LINES["rook"] | LINES["bishop"]
+STEP_ATTACKS = {
+	"knight": bitboard_table(KNIGHT_ATTACKS),
+	"king": bitboard_table(KING_ATTACKS),
+	"white pawn": bitboard_table(PAWN_ATTACKS["white"]),
+	"black pawn": bitboard_table(PAWN_ATTACKS["black"])
+}
+PIECE_SLOTS = {
+	"knight": build_piece_slots(KNIGHT_SHIFTS,False),
+	"king": build_piece_slots(KING_SHIFTS,False),
+	"bishop": build_piece_slots(DIAGONAL_SHIFTS,True),
+	"rook": build_piece_slots(RANK_SHIFTS,True),
+	"queen": build_piece_slots(RANK_SHIFTS + DIAGONAL_SHIFTS,True)
+}
+PAWN_SLOTS = {color: build_pawn_slots(color) for color in COLORS}
+PAWN_UNMOVE_SLOTS = {color: build_pawn_unmove_slots(color) for color in COLORS}
+BACK_RANKS = np.array([(square >> 3) in (0,7) for square in range(64)])
+
+def place(table,axes,piece_count):
+	order = np.argsort(axes)
+	shape = [1]*piece_count
+	for axis in axes:
+		shape[axis] = 64
+	return np.transpose(table,order).reshape(shape)
+
+def all_signatures(max_pieces=MAX_PIECES):
+	signatures = []
+	for piece_count in range(3,max_pieces+1):
+		for white_count in range(piece_count-1):
+			for white_letters in combinations_with_replacement("QRBNP",white_count):
+				for black_letters in combinations_with_replacement("QRBNP",piece_count-2-white_count):
+					signature = canonical_signature("K" + "".join(white_letters),"K" + "".join(black_letters))[0]
+					if signature not in signatures:
+						signatures.append(signature)
+	return signatures
+
+def generate_tablebases(signatures,directory=DEFAULT_TABLEBASE_DIRECTORY):
+	generator = TablebaseGenerator(directory,report_table)
+	for signature in signatures:
+		if os.path.isfile(tablebase_path(directory,signature)):
+			print(signature + ": already generated")
+		else:
+			generator.generate(signature)
+
+def report_table(signature,values,elapsed):
+	decided = values[values < UNKNOWN_VALUE]
+	wins = int(np.count_nonzero(decided % 2 == 1))
+	losses = decided.size - wins
+	draws = int(np.count_nonzero(values == DRAW_VALUE))
+	longest = int(decided.max()) if decided.size else 0
+	print(signature + ": " + str(wins) + " wins, " + str(draws) + " draws, " + str(losses) + " losses, longest mate " + str(longest) + " plies (" + "%.1f" % elapsed + "s)",flush=True)
+
+class TablebaseGenerator:
+	def __init__(self,directory,report=None):
+		self.directory = directory
+		self.report = report
+		self.compact_tables = {}
+		self.full_tables = {}
+
+	def generate(self,signature):
+		if signature in self.compact_tables or os.path.isfile(tablebase_path(self.directory,signature)):
+			return
+		start_time = perf_counter()
+		layout = TablebaseLayout(signature)
+		values = self.build(layout)
+		compact = np.ascontiguousarray(values[:,list(layout.region)]).reshape(-1)
+		os.makedirs(self.directory,exist_ok=True)
+		with open(tablebase_path(self.directory,signature),"wb") as table_file:
+			table_file.write(TABLEBASE_HEADER.pack(TABLEBASE_MAGIC,TABLEBASE_VERSION,layout.piece_count,0))
+			table_file.write(compact.tobytes())
+		self.compact_tables[signature] = compact
+		self.full_tables = {}
+		if self.report is not None:
+			self.report(signature,values,perf_counter() - start_time)
+
+	def load_compact(self,signature):
+		if signature not in self.compact_tables:
+			path = tablebase_path(self.directory,signature)
+			if not os.path.isfile(path):
+				self.generate(signature)
+			else:
+				layout = TablebaseLayout(signature)
+				with open(path,"rb") as table_file:
+					magic, version, piece_count, reserved = TABLEBASE_HEADER.unpack(table_file.read(TABLEBASE_HEADER.size))
+					compact = np.fromfile(table_file,dtype=np.uint8)
+				if magic != TABLEBASE_MAGIC or version != TABLEBASE_VERSION or compact.size != layout.size:
+					raise InvalidTablebaseError(path)
+				self.compact_tables[signature] = compact
+		return self.compact_tables[signature]
+
+	def full_table(self,pieces):
+		key = tuple(pieces)
+		if key in self.full_tables:
+			return self.full_tables[key]
+		piece_count = len(pieces)
+		if piece_count == 2:
+			values = np.full((2,64,64),DRAW_VALUE,dtype=np.uint8)
+			values[:,STEP_ATTACKS["king"] | np.eye(64,dtype=bool)] = ILLEGAL_VALUE
+			self.full_tables[key] = values
+			return values
+
+		signature, swapped = canonical_signature(pieces_letters(pieces,"white"),pieces_letters(pieces,"black"))
+		compact = self.load_compact(signature)
+		layout = TablebaseLayout(signature)
+		board_pieces = [(get_opponent_color(color) if swapped else color,piece_type) for color, piece_type in pieces]
+		axes = []
+		for layout_piece in layout.pieces:
+			for axis, piece in enumerate(board_pieces):
+				if piece == layout_piece and axis not in axes:
+					axes.append(axis)
+					break
+
+		flipped = SQUARES ^ 56 if swapped else SQUARES
+		transforms = np.array(TRANSFORM_TABLES)
+		king_transforms = np.array(layout.king_transforms)[flipped]
+		region_indices = np.array([-1 if region_index is None else region_index for region_index in layout.region_indices])
+		king_axis = axes[0]
+		index = place(region_indices[transforms[king_transforms,flipped]]*64**(piece_count-1),(king_axis,),piece_count)
+		mapped_squares = transforms[king_transforms[:,None],flipped[None,:]]
+		for position, axis in enumerate(axes[1:]):
+			index = index + place(mapped_squares*64**(piece_count-2-position),(king_axis,axis),piece_count)
+
+		values = np.empty((2,) + (64,)*piece_count,dtype=np.uint8)
+		for stm in range(2):
+			table_stm = 1 - stm if swapped else stm
+			values[stm] = compact[table_stm*layout.positions_per_side + index]
+		self.full_tables[key] = values
+		return values
+
+	def build(self,layout):
+		pieces = layout.pieces
+		piece_count = len(pieces)
+		shape = (64,)*piece_count
+
+		invalid = np.zeros(shape,dtype=bool)
+		for axis in range(piece_count):
+			for other_axis in range(axis+1,piece_count):
+				invalid |= place(np.eye(64,dtype=bool),(axis,other_axis),piece_count)
+			if pieces[axis][1] == "pawn":
+				invalid |= place(BACK_RANKS,(axis,),piece_count)
+		in_check = {color: self.king_attacked(pieces,color) for color in COLORS}
+		illegal = [invalid | in_check["black"],invalid | in_check["white"]]
+
+		values = np.full((2,) + shape,UNKNOWN_VALUE,dtype=np.uint8)
+		counts = np.zeros((2,) + shape,dtype=np.uint8)
+		exits = {
+			"win": np.full((2,) + shape,NO_EXIT,dtype=np.uint8),
+			"loss": np.zeros((2,) + shape,dtype=np.uint8),
+			"draw": np.zeros((2,) + shape,dtype=bool),
+			"any": np.zeros((2,) + shape,dtype=bool)
+		}
+		for stm, color in enumerate(COLORS):
+			for axis, (piece_color, piece_type) in enumerate(pieces):
+				if piece_color == color:
+					slots = PAWN_SLOTS[color] if piece_type == "pawn" else PIECE_SLOTS[piece_type]
+					for slot in slots:
+						self.count_moves(pieces,stm,axis,slot,illegal,counts,exits)
+
+			has_move = exits["any"][stm] | (counts[stm] > 0)
+			legal = ~illegal[stm]
+			values[stm][legal & ~has_move & in_check[color]] = 0
+			values[stm][legal & ~has_move & ~in_check[color]] = DRAW_VALUE
+			values[stm][illegal[stm]] = ILLEGAL_VALUE
+
+		loss_levels = np.full((2,) + shape,NO_EXIT,dtype=np.uint8)
+		only_losing_exits = (values == UNKNOWN_VALUE) & (counts == 0) & (exits["win"] == NO_EXIT) & ~exits["draw"]
+		loss_levels[only_losing_exits] = exits["loss"][only_losing_exits]
+		self.propagate(pieces,values,counts,exits,loss_levels)
+		return values
+
+	def king_attacked(self,pieces,color):
+		piece_count = len(pieces)
+		king_axis = pieces.index((color,"king"))
+		attacked = np.zeros((64,)*piece_count,dtype=bool)
+		for axis, (piece_color, piece_type) in enumerate(pieces):
+			if piece_color == color:
+				continue
+			if piece_type in LINES:
+				attacks = place(LINES[piece_type],(axis,king_axis),piece_count)
+				for other_axis in range(piece_count):
+					if other_axis != axis and other_axis != king_axis:
+						attacks = attacks & ~place(BETWEEN,(axis,king_axis,other_axis),piece_count)
+			elif piece_type == "pawn":
+				attacks = place(STEP_ATTACKS[piece_color + " pawn"],(axis,king_axis),piece_count)
+			else:
+				attacks = place(STEP_ATTACKS[piece_type],(axis,king_axis),piece_count)
+			attacked |= attacks
+		return attacked
+
+	def count_moves(self,pieces,stm,axis,slot,illegal,counts,exits):
+		piece_count = len(pieces)
+		color = COLORS[stm]
+		target = np.where(slot.dest >= 0,slot.dest,0)
+		movable = place(slot.dest >= 0,(axis,),piece_count) & ~illegal[stm]
+		occupied = {}
+		for other_axis in range(piece_count):
+			if other_axis == axis:
+				continue
+			occupied[other_axis] = place(target[:,None] == SQUARES[None,:],(axis,other_axis),piece_count)
+			if slot.check_path:
+				movable = movable & ~place(BETWEEN[SQUARES,target],(axis,other_axis),piece_count)
+			if pieces[other_axis][0] == color:
+				movable = movable & ~occupied[other_axis]
+		promotes = place(slot.promotes,(axis,),piece_count) if slot.promotes is not None else np.zeros((1,)*piece_count,dtype=bool)
+
+		if slot.mode != "capture":
+			quiet = movable
+			for other_axis in occupied:
+				quiet = quiet & ~occupied[other_axis]
+			in_table = quiet & ~promotes & ~np.take(illegal[1-stm],target,axis=axis)
+			counts[stm] += in_table
+			if slot.promotes is not None:
+				for promotion_type in PROMOTION_TYPES:
+					promoted_pieces = pieces[:axis] + [(color,promotion_type)] + pieces[axis+1:]
+					self.record_exit(stm,quiet & promotes,np.take(self.full_table(promoted_pieces)[1-stm],target,axis=axis),exits)
+
+		if slot.mode != "quiet":
+			for other_axis in occupied:
+				if pieces[other_axis][0] == color or pieces[other_axis][1] == "king":
+					continue
+				capture = movable & occupied[other_axis]
+				remaining_pieces = pieces[:other_axis] + pieces[other_axis+1:]
+				remaining_axis = axis - 1 if other_axis < axis else axis
+				if slot.promotes is not None:
+					variants = [(capture & ~promotes,remaining_pieces)]
+					for promotion_type in PROMOTION_TYPES:
+						variants.append((capture & promotes,remaining_pieces[:remaining_axis] + [(color,promotion_type)] + remaining_pieces[remaining_axis+1:]))
+				else:
+					variants = [(capture,remaining_pieces)]
+				for variant_mask, variant_pieces in variants:
+					captured_values = np.take(self.full_table(variant_pieces)[1-stm],target,axis=remaining_axis)
+					self.record_exit(stm,variant_mask,np.expand_dims(captured_values,other_axis),exits)
+
+	def record_exit(self,stm,mask,exit_values,exits):
+		legal = mask & (exit_values != ILLEGAL_VALUE)
+		if not np.any(legal):
+			return
+		exits["any"][stm] |= legal
+		opponent_loses = legal & (exit_values % 2 == 0)
+		opponent_wins = legal & (exit_values % 2 == 1) & (exit_values != DRAW_VALUE)
+		exits["win"][stm] = np.where(opponent_loses,np.minimum(exits["win"][stm],exit_values + 1),exits["win"][stm])
+		exits["loss"][stm] = np.where(opponent_wins,np.maximum(exits["loss"][stm],exit_values + 1),exits["loss"][stm])
+		exits["draw"][stm] |= legal & (exit_values == DRAW_VALUE)
+
+	def propagate(self,pieces,values,counts,exits,loss_levels):
+		flat_values = values.reshape(-1)
+		flat_counts = counts.reshape(-1)
+		flat_exit_wins = exits["win"].reshape(-1)
+		flat_exit_losses = exits["loss"].reshape(-1)
+		flat_draw_exits = exits["draw"].reshape(-1)
+		flat_loss_levels = loss_levels.reshape(-1)
+		last_scheduled = max(int(flat_exit_wins[flat_exit_wins != NO_EXIT].max(initial=0)),int(flat_loss_levels[flat_loss_levels != NO_EXIT].max(initial=0)))
+
+		level = 0
+		frontier = np.flatnonzero(flat_values == 0)
+		while frontier.size or level < last_scheduled:
+			for start in range(0,frontier.size,FRONTIER_CHUNK_SIZE):
+				predecessors = self.unmove(pieces,frontier[start:start+FRONTIER_CHUNK_SIZE],values.shape)
+				predecessors = predecessors[flat_values[predecessors] == UNKNOWN_VALUE]
+				if level % 2 == 0:
+					flat_values[predecessors] = level + 1
+				else:
+					decided, multiplicity = np.unique(predecessors,return_counts=True)
+					flat_counts[decided] -= multiplicity.astype(np.uint8)
+					exhausted = decided[flat_counts[decided] == 0]
+					exhausted = exhausted[(flat_exit_wins[exhausted] == NO_EXIT) & ~flat_draw_exits[exhausted]]
+					losing_levels = np.maximum(flat_exit_losses[exhausted],level + 1)
+					flat_loss_levels[exhausted] = losing_levels
+					flat_values[exhausted[losing_levels == level + 1]] = level + 1
+					last_scheduled = max(last_scheduled,int(losing_levels.max(initial=0)))
+
+			level += 1
+			if level >= UNKNOWN_VALUE:
+				raise OverflowError("distance to mate exceeds the tablebase value range")
+			if level % 2 == 1:
+				scheduled = (flat_exit_wins == level) & (flat_values == UNKNOWN_VALUE)
+			else:
+				scheduled = (flat_loss_levels == level) & (flat_values == UNKNOWN_VALUE)
+			flat_values[scheduled] = level
+			frontier = np.flatnonzero(flat_values == level)
+
+		flat_values[flat_values == UNKNOWN_VALUE] = DRAW_VALUE
+
+	def unmove(self,pieces,frontier,shape):
+		piece_count = len(pieces)
+		coordinates = np.unravel_index(frontier,shape)
+		predecessors = []
+		for stm in range(2):
+			selected = coordinates[0] == stm
+			if not np.any(selected):
+				continue
+			squares = [coordinate[selected] for coordinate in coordinates[1:]]
+			mover_color = COLORS[1-stm]
+			base_index = (1-stm)*64**piece_count
+			for axis in range(piece_count):
+				base_index = base_index + squares[axis]*64**(piece_count-1-axis)
+
+			for axis, (piece_color, piece_type) in enumerate(pieces):
+				if piece_color != mover_color:
+					continue
+				current = squares[axis]
+				slots = PAWN_UNMOVE_SLOTS[piece_color] if piece_type == "pawn" else PIECE_SLOTS[piece_type]
+				for slot in slots:
+					origin = slot.dest[current]
+					possible = origin >= 0
+					origin = np.where(possible,origin,0)
+					for other_axis in range(piece_count):
+						if other_axis != axis:
+							possible &= squares[other_axis] != origin
+							if slot.check_path:
+								possible &= ~BETWEEN[current,origin,squares[other_axis]]
+					predecessors.append((base_index + (origin - current)*64**(piece_count-1-axis))[possible])
+		if not predecessors:
+			return np.zeros(0,dtype=np.int64)
+		return np.concatenate(predecessors)
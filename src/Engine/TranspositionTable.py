@@ -0,0 +1,25 @@
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+DEFAULT_TABLE_SIZE = 1 << 18
+
+class TranspositionTable:
+	def __init__(self,size=DEFAULT_TABLE_SIZE):
+		self.size = size
+		self.entries = [None]*size
+
+	def probe(self,key):
+		entry = self.entries[key % self.size]
+		if entry is not None and entry[0] == key:
+			return entry
+		return None
+
+	def store(self,key,depth,score,flag,move):
+		index = key % self.size
+		entry = self.entries[index]
+		if entry is None or entry[0] != key or depth >= entry[1]:
+			self.entries[index] = (key,depth,score,flag,move)
+
+	def clear(self):
+		self.entries = [None]*self.size
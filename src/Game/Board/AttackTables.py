@@ -0,0 +1,84 @@
+from .Bitboard import KNIGHT_SHIFTS, KING_SHIFTS, square_index, square_rank, square_file, is_valid_square
+
+POSITIVE_RANK_SHIFTS = ((1,0),(0,1))
+NEGATIVE_RANK_SHIFTS = ((-1,0),(0,-1))
+POSITIVE_DIAGONAL_SHIFTS = ((1,1),(1,-1))
+NEGATIVE_DIAGONAL_SHIFTS = ((-1,-1),(-1,1))
+
+def build_step_table(shifts):
+	table = []
+	for square in range(64):
+		attacked_squares = 0
+		for rank_shift, file_shift in shifts:
+			rank = square_rank(square) + rank_shift
+			file = square_file(square) + file_shift
+			if is_valid_square(rank,file):
+				attacked_squares |= 1 << square_index(rank,file)
+		table.append(attacked_squares)
+	return table
+
+def build_ray_table(rank_shift,file_shift):
+	table = []
+	for square in range(64):
+		ray = 0
+		rank = square_rank(square) + rank_shift
+		file = square_file(square) + file_shift
+		while is_valid_square(rank,file):
+			ray |= 1 << square_index(rank,file)
+			rank += rank_shift
+			file += file_shift
+		table.append(ray)
+	return table
+
+KNIGHT_ATTACKS = build_step_table(KNIGHT_SHIFTS)
+KING_ATTACKS = build_step_table(KING_SHIFTS)
+PAWN_ATTACKS = {
+	"white": build_step_table(((1,-1),(1,1))),
+	"black": build_step_table(((-1,-1),(-1,1)))
+}
+RAYS = {}
+for shift in POSITIVE_RANK_SHIFTS + NEGATIVE_RANK_SHIFTS + POSITIVE_DIAGONAL_SHIFTS + NEGATIVE_DIAGONAL_SHIFTS:
+	RAYS[shift] = build_ray_table(*shift)
+
+def build_between_table():
+	table = [[0]*64 for square in range(64)]
+	for square in range(64):
+		for rank_shift, file_shift in RAYS:
+			between = 0
+			rank = square_rank(square) + rank_shift
+			file = square_file(square) + file_shift
+			while is_valid_square(rank,file):
+				table[square][square_index(rank,file)] = between
+				between |= 1 << square_index(rank,file)
+				rank += rank_shift
+				file += file_shift
+	return table
+
+BETWEEN = build_between_table()
+
+POSITIVE_RANK_RAYS = tuple(RAYS[shift] for shift in POSITIVE_RANK_SHIFTS)
+NEGATIVE_RANK_RAYS = tuple(RAYS[shift] for shift in NEGATIVE_RANK_SHIFTS)
+POSITIVE_DIAGONAL_RAYS = tuple(RAYS[shift] for shift in POSITIVE_DIAGONAL_SHIFTS)
+NEGATIVE_DIAGONAL_RAYS = tuple(RAYS[shift] for shift in NEGATIVE_DIAGONAL_SHIFTS)
+
+def sliding_attacks(square,occupied,positive_rays,negative_rays):
+	attacked_squares = 0
+	for rays in positive_rays:
+		ray = rays[square]
+		blockers = ray & occupied
+		if blockers:
+			ray ^= rays[(blockers & -blockers).bit_length() - 1]
+		attacked_squares |= ray
+	for rays in negative_rays:
+		ray = rays[square]
+		blockers = ray & occupied
+		if blockers:
+			ray ^= rays[blockers.bit_length() - 1]
+		attacked_squares |= ray
+	return attacked_squares
+
+def rook_attacks(square,occupied):
+	return sliding_attacks(square,occupied,POSITIVE_RANK_RAYS,NEGATIVE_RANK_RAYS)
+
+def bishop_attacks(square,occupied):
+	return sliding_attacks(square,occupied,POSITIVE_DIAGONAL_RAYS,NEGATIVE_DIAGONAL_RAYS)
@@ -0,0 +1,39 @@
+from .Position import INTERNED_POSITIONS
+
+COLORS = ("white","black")
+PIECE_TYPES = ("pawn","knight","bishop","rook","queen","king")
+
+RANK_SHIFTS = ((1,0),(-1,0),(0,1),(0,-1))
+DIAGONAL_SHIFTS = ((1,1),(-1,-1),(-1,1),(1,-1))
+KNIGHT_SHIFTS = ((-2,-1),(-2,1),(-1,-2),(-1,2),(1,-2),(1,2),(2,-1),(2,1))
+KING_SHIFTS = ((-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1))
+
+def square_index(rank,file):
+	return rank*8 + file
+
+def square_rank(square):
+	return square >> 3
+
+def square_file(square):
+	return square & 7
+
+def is_valid_square(rank,file):
+	return rank >= 0 and rank <= 7 and file >= 0 and file <= 7
+
+def position_to_square(position):
+	return position.rank*8 + position.file
+
+def square_to_position(square):
+	return INTERNED_POSITIONS[square]
+
+def square_name(square):
+	return chr((square & 7)+97) + str((square >> 3)+1)
+
+def iterate_squares(mask):
+	while mask:
+		low_bit = mask & -mask
+		yield low_bit.bit_length() - 1
+		mask ^= low_bit
+
+def first_square(mask):
+	return (mask & -mask).bit_length() - 1
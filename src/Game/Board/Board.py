@@ -1,16 +1,97 @@
-from .Square import Square
-from .Piece import Piece
+from .Square import get_square
+from .Piece import get_piece, EMPTY_PIECE
 from .Position import Position
-from .BoardErrors import InvalidPositionError, NoPieceError, EmptySquareError, InvalidMoveError, InvalidPieceCheckError, InvalidCastleError
-from ..Utils import get_opponent_color, get_direction, get_castle_rank, get_pawn_rank, get_color_prefix
-import copy
+from .BoardErrors import InvalidPositionError, NoPieceError, EmptySquareError, SameSquareError, InvalidMoveError, InvalidPromotionTypeError, InvalidCastleError, AttackMapMismatchError, InvalidFENError
+from .Bitboard import COLORS, PIECE_TYPES, square_index, square_rank, square_file, position_to_square, square_to_position, square_name, iterate_squares, first_square
+from .Move import Move
+from .Zobrist import PIECE_KEYS, EN_PASSANT_KEYS, WHITE_TURN_KEY, hash_castling_rights
+from .AttackTables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, rook_attacks, bishop_attacks
+from .CheckState import CheckState, ALL_SQUARES, find_attackers
+from ..Utils import get_opponent_color, get_direction, get_castle_rank, get_pawn_rank
 from numpy import ndarray
+from os import environ
+import re
+
+DEBUG_ATTACKS = environ.get("CLICHESS_DEBUG_ATTACKS","") == "1"
+
+BACK_RANK = ("rook","knight","bishop","queen","king","bishop","knight","rook")
+PROMOTION_TYPES = ("queen","rook","knight","bishop")
+PROMOTION_RANKS = 0xFF000000000000FF
+SLIDER_TYPES = ("bishop","rook","queen")
+FEN_PIECE_TYPES = {
+	"p": "pawn",
+	"r": "rook",
+	"n": "knight",
+	"b": "bishop",
+	"q": "queen",
+	"k": "king"
+}
+FEN_PIECE_LETTERS = {piece_type: letter for letter, piece_type in FEN_PIECE_TYPES.items()}
+FEN_RANK_REGEX = re.compile("^[pnbrqkPNBRQK1-8]+$")
+FEN_CASTLING_REGEX = re.compile("^(-|K?Q?k?q?)$")
+FEN_EN_PASSANT_REGEX = re.compile("^(-|[a-h][36])$")
+CASTLE_SQUARES = {
+	"short": {
+		"rook_file": 7,
+		"king_end_file": 6,
+		"rook_end_file": 5,
+		"empty_files": (5,6),
+		"safe_files": (4,5,6)
+	},
+	"long": {
+		"rook_file": 0,
+		"king_end_file": 2,
+		"rook_end_file": 3,
+		"empty_files": (1,2,3),
+		"safe_files": (4,3,2)
+	}
+}
+CASTLE_CORNERS = {
+	square_index(0,0): ("white","long"),
+	square_index(0,7): ("white","short"),
+	square_index(7,0): ("black","long"),
+	square_index(7,7): ("black","short")
+}
 
 class Board:
 	def __init__(self):
-		self.board = ndarray((8,8),dtype=object)
+		self.bitboards = {
+			"white": dict.fromkeys(PIECE_TYPES,0),
+			"black": dict.fromkeys(PIECE_TYPES,0)
+		}
+		self.occupancy = {
+			"white": 0,
+			"black": 0
+		}
+		self.attacked_squares = {
+			"white": 0,
+			"black": 0
+		}
+		self.attacks_from = [0]*64
+		self.stale_attack_squares = ALL_SQUARES
+		self.attacks_dirty = True
+		self.debug_attacks = DEBUG_ATTACKS
+		self.clear_check_states()
+		self.castling_rights = {
+			"white": {
+				"short": True,
+				"long": True
+			},
+			"black": {
+				"short": True,
+				"long": True
+			}
+		}
+		self.en_passant_square = None
+		self.turn_color = "white"
+		self.fullmove_number = 1
+		self.move_stack = []
+		self.hash = 0
+		self.highlighted = 0
+		self.board_view = None
+		self.tablebase = None
 		self.turns_since_last_capture = 0
-		self.board_encodings = []
+		self.position_counts = {}
 		self.pieces = {
 			"white":
 			{
@@ -34,47 +115,176 @@ class Board:
 			"black": Position(7,4)
 		}
 		for file in range(8):
-			self.board[1,file] = Square(Position(1,file),Piece("pawn","white","wp" + str(file) + "1"))
-			self.board[6,file] = Square(Position(6,file),Piece("pawn","black","wp" + str(file) + "6"))
-
-		self.board[0,0] = Square(Position(0,0),Piece("rook","white","wRa1"))
-		self.board[0,7] = Square(Position(0,7),Piece("rook","white","wRh1"))
-		self.board[7,0] = Square(Position(7,0),Piece("rook","black","bRa8"))
-		self.board[7,7] = Square(Position(7,7),Piece("rook","black","bRh8"))
-
-		self.board[0,1] = Square(Position(0,1),Piece("knight","white","wNb1"))
-		self.board[0,6] = Square(Position(0,6),Piece("knight","white","wNg1"))
-		self.board[7,1] = Square(Position(7,1),Piece("knight","black","bNb8"))
-		self.board[7,6] = Square(Position(7,6),Piece("knight","black","bNg8"))
-
-		self.board[0,2] = Square(Position(0,2),Piece("bishop","white","wBc1"))
-		self.board[0,5] = Square(Position(0,5),Piece("bishop","white","wBf1"))
-		self.board[7,2] = Square(Position(7,2),Piece("bishop","black","bBc8"))
-		self.board[7,5] = Square(Position(7,5),Piece("bishop","black","bBf8"))
-
-		self.board[0,3] = Square(Position(0,3),Piece("queen","white","wQd1"))
-		self.board[0,4] = Square(Position(0,4),Piece("king","white","wKe1"))
-		self.board[7,3] = Square(Position(7,3),Piece("queen","black","bQd8"))
-		self.board[7,4] = Square(Position(7,4),Piece("king","black","bKe8"))
-
-		for file in range(8):
-			for rank in range(4):
-				self.board[rank+2,file] = Square(Position(rank+2,file),Piece("nopiece","none","np"))
-
-		self.evaluate_attacked_squares()
-		self.evaluate_valid_moves()
+			self.place_piece(square_index(0,file),BACK_RANK[file],"white")
+			self.place_piece(square_index(1,file),"pawn","white")
+			self.place_piece(square_index(6,file),"pawn","black")
+			self.place_piece(square_index(7,file),BACK_RANK[file],"black")
+
+		self.hash = self.compute_hash()
+		self.position_counts = {self.hash: 1}
+
+	@classmethod
+	def from_fen(cls,fen):
+		board = cls()
+		board.load_fen(fen)
+		return board
+
+	def load_fen(self,fen):
+		fields = validate_fen(fen)
+		self.clear_pieces()
+		rank = 7
+		file = 0
+		for character in fields[0]:
+			if character == "/":
+				rank -= 1
+				file = 0
+			elif character.isdigit():
+				file += int(character)
+			else:
+				color = "white" if character.isupper() else "black"
+				self.place_piece(square_index(rank,file),FEN_PIECE_TYPES[character.lower()],color)
+				file += 1
+
+		self.turn_color = "white" if fields[1] == "w" else "black"
+		self.castling_rights = {
+			"white": {
+				"short": "K" in fields[2],
+				"long": "Q" in fields[2]
+			},
+			"black": {
+				"short": "k" in fields[2],
+				"long": "q" in fields[2]
+			}
+		}
+		if fields[3] != "-":
+			self.en_passant_square = square_index(int(fields[3][1])-1,ord(fields[3][0])-97)
+		else:
+			self.en_passant_square = None
+		self.turns_since_last_capture = int(fields[4]) if len(fields) > 4 else 0
+		self.fullmove_number = max(int(fields[5]),1) if len(fields) > 5 else 1
+		self.finish_loading()
+		if not self.is_legal_setup():
+			raise InvalidFENError(fen)
+
+	def clear_pieces(self):
+		self.hash = 0
+		for color in COLORS:
+			self.bitboards[color] = dict.fromkeys(PIECE_TYPES,0)
+			self.occupancy[color] = 0
+
+	def finish_loading(self):
+		for color in COLORS:
+			for piece_type in PROMOTION_TYPES + ("pawn",):
+				self.pieces[color][piece_type + "s"] = self.bitboards[color][piece_type].bit_count()
+			self.king_positions[color] = square_to_position(first_square(self.bitboards[color]["king"]))
+
+		self.move_stack = []
+		self.highlighted = 0
+		self.board_view = None
+		self.clear_check_states()
+		self.hash = self.compute_hash()
+		self.position_counts = {self.hash: 1}
+		self.mark_attacks_dirty(ALL_SQUARES)
+
+	def to_fen(self):
+		ranks = []
+		for rank in range(7,-1,-1):
+			rank_text = ""
+			empty_files = 0
+			for file in range(8):
+				piece = self.piece_at(square_index(rank,file))
+				if piece is None:
+					empty_files += 1
+				else:
+					if empty_files:
+						rank_text += str(empty_files)
+						empty_files = 0
+					color, piece_type = piece
+					letter = FEN_PIECE_LETTERS[piece_type]
+					rank_text += letter.upper() if color == "white" else letter
+			if empty_files:
+				rank_text += str(empty_files)
+			ranks.append(rank_text)
+
+		castling = ""
+		for color, letters in (("white","KQ"),("black","kq")):
+			if self.castling_rights[color]["short"]:
+				castling += letters[0]
+			if self.castling_rights[color]["long"]:
+				castling += letters[1]
+		en_passant = square_name(self.en_passant_square) if self.en_passant_square is not None else "-"
+		return " ".join(("/".join(ranks),"w" if self.turn_color == "white" else "b",castling or "-",en_passant,str(self.turns_since_last_capture),str(self.fullmove_number)))
+
+	@property
+	def board(self):
+		if self.board_view is None:
+			self.board_view = self.build_board_view()
+		return self.board_view
+
+	def build_board_view(self):
+		board = ndarray((8,8),dtype=object)
+		for square in range(64):
+			occupant = self.piece_at(square)
+			piece = get_piece(*occupant) if occupant is not None else EMPTY_PIECE
+			board[square >> 3,square & 7] = get_square(square,piece,(self.highlighted >> square) & 1)
+		return board
+
+	def __getstate__(self):
+		return {name: value for name, value in self.__dict__.items() if not hasattr(type(self),name)}
+
+	def place_piece(self,square,piece_type,color):
+		self.bitboards[color][piece_type] |= 1 << square
+		self.occupancy[color] |= 1 << square
+		self.hash ^= PIECE_KEYS[color][piece_type][square]
+
+	def remove_piece(self,square,piece_type,color):
+		self.bitboards[color][piece_type] &= ~(1 << square)
+		self.occupancy[color] &= ~(1 << square)
+		self.hash ^= PIECE_KEYS[color][piece_type][square]
+
+	def compute_hash(self):
+		zobrist_hash = 0
+		for color in COLORS:
+			for piece_type in PIECE_TYPES:
+				for square in iterate_squares(self.bitboards[color][piece_type]):
+					zobrist_hash ^= PIECE_KEYS[color][piece_type][square]
+		zobrist_hash ^= hash_castling_rights(self.castling_rights)
+		zobrist_hash ^= self.en_passant_hash()
+		if self.turn_color == "white":
+			zobrist_hash ^= WHITE_TURN_KEY
+		return zobrist_hash
+
+	def en_passant_hash(self):
+		if self.en_passant_square is not None:
+			capturing_color = self.turn_color
+			if PAWN_ATTACKS[get_opponent_color(capturing_color)][self.en_passant_square] & self.bitboards[capturing_color]["pawn"]:
+				return EN_PASSANT_KEYS[square_file(self.en_passant_square)]
+		return 0
+
+	def piece_type_at(self,square,color):
+		if (self.occupancy[color] >> square) & 1:
+			for piece_type in PIECE_TYPES:
+				if (self.bitboards[color][piece_type] >> square) & 1:
+					return piece_type
+		return None
+
+	def piece_at(self,square):
+		for color in COLORS:
+			piece_type = self.piece_type_at(square,color)
+			if piece_type is not None:
+				return (color,piece_type)
+		return None
 
 	def highlight_possible_moves(self,position):
 		if self.is_valid_position(position):
-			piece = self.board[position.rank,position.file].piece
-			if piece.type != "nopiece":
-				self.board[position.rank,position.file].is_highlighted = True
-				for rank in range(8):
-					for file in range(8):
-						if self.is_valid_move(piece,position,Position(rank,file)):
-							self.board[rank,file].is_highlighted = True
+			square = position_to_square(position)
+			occupant = self.piece_at(square)
+			if occupant is not None:
+				color, piece_type = occupant
+				self.highlighted = (1 << square) | self.evaluate_legal_destinations(square,piece_type,color)
+				self.board_view = None
 			else:
-				raise EmptySquareError(position,piece.color)
+				raise EmptySquareError(position)
 		else:
 			raise InvalidPositionError(position)
 
@@ -82,108 +292,252 @@ class Board:
 		if start != end:
 			if self.is_valid_position(start):
 				if self.is_valid_position(end):
-					piece_to_move = self.board[start.rank,start.file].piece
-					piece_to_take = self.board[end.rank,end.file].piece
-					if piece_to_move.type != "nopiece":
-						if self.is_valid_move(piece_to_move,start,end):
-							self.move_piece(start,end,turn_color,promotion_type,piece_to_move,piece_to_take)
-							self.unhighlight_squares()
-							self.evaluate_attacked_squares()
-							self.clear_en_pessantability(turn_color)
+					start_square = position_to_square(start)
+					end_square = position_to_square(end)
+					piece_type = self.piece_type_at(start_square,turn_color)
+					if piece_type is not None:
+						if self.is_valid_move(piece_type,turn_color,start_square,end_square):
+							self.move_piece(start_square,end_square,turn_color,promotion_type,piece_type)
 						else:
-							raise InvalidMoveError(piece_to_move.type,start,end)
+							raise InvalidMoveError(piece_type,start,end)
 					else:
 						raise NoPieceError(start,turn_color)
 				else:
 					raise InvalidPositionError(end)
 			else:
-				raise InvalidPositionError(end)
+				raise InvalidPositionError(start)
 		else:
 			raise SameSquareError(start)
 
-	def move_piece(self,start,end,turn_color,promotion_type,piece_to_move,piece_to_take):
-		opponent_color = get_opponent_color(turn_color)
-		if self.is_check(opponent_color) and piece_to_move.type != "king":
-			raise InvalidPieceCheckError(piece_to_move.type)
-
-		if piece_to_move.type == "pawn" :
-			if end.rank == 0 or end.rank == 7:
-				if promotion_type == "queen":
-					piece_to_move.type = "queen"
-				elif promotion_type == "rook":
-					piece_to_move.type = "rook"
-				elif promotion_type == "knight":
-					piece_to_move.type = "knight"
-				elif promotion_type == "bishop":
-					piece_to_move.type = "bishop"
-				else:
-					raise InvalidPromotionTypeError(start,end)
-				self.pieces[turn_color][promotion_type] += 1
-				self.pieces[turn_color]["pawn"] -= 1
-			elif abs(end.file-start.file) == 2:
-				direction = get_direction(turn_color)
-				self.board[start.rank+direction*1,start.file].is_en_pessantable_by[opponent_color] = True
-
-		if piece_to_take.type != "nopiece":
-			self.take_piece(piece_to_take,turn_color)
+	def move_piece(self,start,end,turn_color,promotion_type,piece_type):
+		if piece_type == "pawn" and (square_rank(end) == 0 or square_rank(end) == 7):
+			if promotion_type not in PROMOTION_TYPES:
+				raise InvalidPromotionTypeError(square_to_position(start),square_to_position(end))
 		else:
-			self.turns_since_last_capture += 1
+			promotion_type = None
 
-		if piece_to_move.type == "king":
-			self.king_positions[turn_color] = copy.deepcopy(end)
+		self.apply_move(Move(start,end,promotion_type))
 
-		piece_to_move.position = copy.deepcopy(end)
-		piece_to_move.has_moved = True
-		self.board[end.rank,end.file].piece = copy.deepcopy(piece_to_move)
-		self.board[start.rank,start.file].piece = Piece("nopiece","none","np")
+	def apply_move(self,move):
+		self.push(move)
+		self.unhighlight_squares()
 
 	def castle(self,turn_color,direction):
+		if direction in CASTLE_SQUARES and self.can_castle(turn_color,direction):
+			castle_rank = get_castle_rank(turn_color)
+			self.apply_move(Move(square_index(castle_rank,4),square_index(castle_rank,CASTLE_SQUARES[direction]["king_end_file"])))
+		else:
+			raise InvalidCastleError(turn_color)
+
+	def can_castle(self,turn_color,direction):
 		castle_rank = get_castle_rank(turn_color)
 		opponent_color = get_opponent_color(turn_color)
+		castle_squares = CASTLE_SQUARES[direction]
 
-		king_position = self.king_positions[turn_color]
-		if king_position == Position(castle_rank,4) and not self.board[king_position.rank,king_position.file].piece.has_moved and not self.is_check(opponent_color):
-			if direction == "short":
-				corner_piece = self.board[castle_rank,7].piece
-				inner_square_1 = self.board[castle_rank,5]
-				inner_square_2 = self.board[castle_rank,6]
-				if corner_piece.type == "rook" and not corner_piece.has_moved and inner_square_1.piece.type == "nopiece" and not inner_square_1.is_attacked_by[opponent_color] and inner_square_2.piece.type == "nopiece" and not inner_square_2.is_attacked_by[opponent_color]:
-					king = self.board[castle_rank,4].piece
-					king.has_moved = True
-					self.board[castle_rank,6].piece = copy.deepcopy(king)
-
-					corner_piece.has_moved = True
-					self.board[castle_rank,5].piece = copy.deepcopy(corner_piece)
-
-					self.board[castle_rank,4].piece = Piece("nopiece","none","np")
-					self.board[castle_rank,7].piece = Piece("nopiece","none","np")
-				else:
-					raise InvalidCastleError(turn_color)
-			elif direction == "long":
-				corner_piece = self.board[castle_rank,0].piece
-				inner_square_1 = self.board[castle_rank,1]
-				inner_square_2 = self.board[castle_rank,2]
-				inner_square_3 = self.board[castle_rank,3]
-				if corner_piece.type == "rook" and not corner_piece.has_moved and inner_square_1.piece.type == "nopiece"  and not inner_square_1.is_attacked_by[opponent_color] and inner_square_2.piece.type == "nopiece" and not inner_square_2.is_attacked_by[opponent_color] and inner_square_3.piece.type == "nopiece" and not inner_square_3.is_attacked_by[opponent_color]:
-					king = self.board[castle_rank,4].piece
-					king.has_moved = True
-					self.board[castle_rank,2].piece = copy.deepcopy(king)
-
-					corner_piece.has_moved = True
-					self.board[castle_rank,3].piece = copy.deepcopy(corner_piece)
-
-					self.board[castle_rank,4].piece = Piece("nopiece","none","np")
-					self.board[castle_rank,0].piece = Piece("nopiece","none","np")
-				else:
-					raise InvalidCastleError(turn_color)
-			else:
-				raise InvalidCastleError(turn_color)
+		if not self.castling_rights[turn_color][direction] or self.is_check(opponent_color):
+			return False
+		if not (self.bitboards[turn_color]["king"] >> square_index(castle_rank,4)) & 1:
+			return False
+		if not (self.bitboards[turn_color]["rook"] >> square_index(castle_rank,castle_squares["rook_file"])) & 1:
+			return False
+		occupied = self.occupancy["white"] | self.occupancy["black"]
+		for file in castle_squares["empty_files"]:
+			if (occupied >> square_index(castle_rank,file)) & 1:
+				return False
+		for file in castle_squares["safe_files"]:
+			if self.is_square_attacked(square_index(castle_rank,file),opponent_color):
+				return False
+		return True
 
-			self.unhighlight_squares()
-			self.evaluate_attacked_squares()
-			self.clear_en_pessantability(turn_color)
+	def push(self,move):
+		start = move.start
+		end = move.end
+		turn_color = "white" if (self.occupancy["white"] >> start) & 1 else "black"
+		opponent_color = get_opponent_color(turn_color)
+		piece_type = self.piece_type_at(start,turn_color)
+
+		captured_square = end
+		if piece_type == "pawn" and end == self.en_passant_square:
+			captured_square = end - 8*get_direction(turn_color)
+		captured_type = self.piece_type_at(captured_square,opponent_color)
+
+		self.move_stack.append((move,piece_type,captured_type,captured_square,self.castling_rights,self.en_passant_square,self.turns_since_last_capture,self.check_states,self.hash,self.position_counts))
+		self.hash ^= self.en_passant_hash()
+
+		changed_squares = (1 << start) | (1 << end) | (1 << captured_square)
+		if captured_type is not None:
+			self.remove_piece(captured_square,captured_type,opponent_color)
+			self.take_piece(captured_type,opponent_color)
+		elif piece_type == "pawn":
+			self.turns_since_last_capture = 0
 		else:
-			raise InvalidCastleError(turn_color)
+			self.turns_since_last_capture += 1
+
+		self.remove_piece(start,piece_type,turn_color)
+		if move.promotion_type is not None:
+			self.place_piece(end,move.promotion_type,turn_color)
+			self.pieces[turn_color][move.promotion_type + "s"] += 1
+			self.pieces[turn_color]["pawns"] -= 1
+		else:
+			self.place_piece(end,piece_type,turn_color)
+
+		if piece_type == "king":
+			self.king_positions[turn_color] = square_to_position(end)
+			if abs(end-start) == 2:
+				changed_squares |= self.move_castling_rook(start,end,turn_color)
+
+		self.update_castling_rights(start,end,piece_type,turn_color)
+		if piece_type == "pawn" and abs(end-start) == 16:
+			self.en_passant_square = (start+end) // 2
+		else:
+			self.en_passant_square = None
+		self.turn_color = opponent_color
+		if turn_color == "black":
+			self.fullmove_number += 1
+		self.hash ^= WHITE_TURN_KEY ^ self.en_passant_hash()
+		if captured_type is not None or piece_type == "pawn":
+			self.position_counts = {}
+		self.position_counts[self.hash] = self.position_counts.get(self.hash,0) + 1
+		self.clear_check_states()
+		self.board_view = None
+		self.mark_attacks_dirty(changed_squares)
+
+	def pop(self):
+		move, piece_type, captured_type, captured_square, castling_rights, en_passant_square, turns_since_last_capture, check_states, zobrist_hash, position_counts = self.move_stack.pop()
+		if self.position_counts is position_counts:
+			if position_counts[self.hash] > 1:
+				position_counts[self.hash] -= 1
+			else:
+				del position_counts[self.hash]
+		else:
+			self.position_counts = position_counts
+
+		start = move.start
+		end = move.end
+		turn_color = get_opponent_color(self.turn_color)
+		opponent_color = self.turn_color
+
+		changed_squares = (1 << start) | (1 << end) | (1 << captured_square)
+		if move.promotion_type is not None:
+			self.remove_piece(end,move.promotion_type,turn_color)
+			self.pieces[turn_color][move.promotion_type + "s"] -= 1
+			self.pieces[turn_color]["pawns"] += 1
+		else:
+			self.remove_piece(end,piece_type,turn_color)
+		self.place_piece(start,piece_type,turn_color)
+
+		if captured_type is not None:
+			self.place_piece(captured_square,captured_type,opponent_color)
+			if captured_type != "king":
+				self.pieces[opponent_color][captured_type + "s"] += 1
+
+		if piece_type == "king":
+			self.king_positions[turn_color] = square_to_position(start)
+			if abs(end-start) == 2:
+				changed_squares |= self.move_castling_rook(end,start,turn_color)
+
+		self.castling_rights = castling_rights
+		self.en_passant_square = en_passant_square
+		self.turns_since_last_capture = turns_since_last_capture
+		self.turn_color = turn_color
+		if turn_color == "black":
+			self.fullmove_number -= 1
+		self.hash = zobrist_hash
+		self.check_states = check_states
+		self.board_view = None
+		self.mark_attacks_dirty(changed_squares)
+		return move
+
+	def move_castling_rook(self,king_start,king_end,turn_color):
+		castle_rank = square_rank(king_start)
+		if square_file(king_start) == 4:
+			direction = "short" if king_end > king_start else "long"
+			rook_start = square_index(castle_rank,CASTLE_SQUARES[direction]["rook_file"])
+			rook_end = square_index(castle_rank,CASTLE_SQUARES[direction]["rook_end_file"])
+		else:
+			direction = "short" if king_start > king_end else "long"
+			rook_start = square_index(castle_rank,CASTLE_SQUARES[direction]["rook_end_file"])
+			rook_end = square_index(castle_rank,CASTLE_SQUARES[direction]["rook_file"])
+		self.remove_piece(rook_start,"rook",turn_color)
+		self.place_piece(rook_end,"rook",turn_color)
+		return (1 << rook_start) | (1 << rook_end)
+
+	def update_castling_rights(self,start,end,piece_type,turn_color):
+		lost_rights = []
+		if piece_type == "king":
+			lost_rights.append((turn_color,"short"))
+			lost_rights.append((turn_color,"long"))
+		if start in CASTLE_CORNERS:
+			lost_rights.append(CASTLE_CORNERS[start])
+		if end in CASTLE_CORNERS:
+			lost_rights.append(CASTLE_CORNERS[end])
+
+		if any(self.castling_rights[color][direction] for color, direction in lost_rights):
+			self.hash ^= hash_castling_rights(self.castling_rights)
+			self.castling_rights = {
+				"white": dict(self.castling_rights["white"]),
+				"black": dict(self.castling_rights["black"])
+			}
+			for color, direction in lost_rights:
+				self.castling_rights[color][direction] = False
+			self.hash ^= hash_castling_rights(self.castling_rights)
+
+	def legal_moves(self):
+		return self.generate_moves(self.turn_color,self.evaluate_legal_destinations)
+
+	def pseudo_legal_captures(self,turn_color):
+		moves = []
+		capture_targets = self.occupancy[get_opponent_color(turn_color)]
+		for piece_type in PIECE_TYPES:
+			for start in iterate_squares(self.bitboards[turn_color][piece_type]):
+				destinations = self.evaluate_destinations(start,piece_type,turn_color)
+				if piece_type == "pawn":
+					pawn_targets = capture_targets
+					if self.en_passant_square is not None:
+						pawn_targets |= 1 << self.en_passant_square
+					for end in iterate_squares(destinations & PROMOTION_RANKS):
+						moves.append(Move(start,end,"queen"))
+					destinations &= pawn_targets & ~PROMOTION_RANKS
+				else:
+					destinations &= capture_targets
+				for end in iterate_squares(destinations):
+					moves.append(Move(start,end))
+		return moves
+
+	def perft(self,depth):
+		if depth == 0:
+			return 1
+		elif depth == 1:
+			return sum(1 for move in self.legal_moves())
+
+		nodes = 0
+		for move in self.legal_moves():
+			self.push(move)
+			nodes += self.perft(depth-1)
+			self.pop()
+		return nodes
+
+	def pseudo_legal_moves(self,turn_color):
+		return self.generate_moves(turn_color,self.evaluate_destinations)
+
+	def generate_moves(self,turn_color,evaluate_destinations):
+		moves = []
+		for piece_type in PIECE_TYPES:
+			for start in iterate_squares(self.bitboards[turn_color][piece_type]):
+				destinations = evaluate_destinations(start,piece_type,turn_color)
+				if piece_type == "pawn":
+					promotions = destinations & PROMOTION_RANKS
+					for end in iterate_squares(promotions):
+						for promotion_type in PROMOTION_TYPES:
+							moves.append(Move(start,end,promotion_type))
+					destinations &= ~PROMOTION_RANKS
+				for end in iterate_squares(destinations):
+					moves.append(Move(start,end))
+		castle_rank = get_castle_rank(turn_color)
+		for direction in CASTLE_SQUARES:
+			if self.can_castle(turn_color,direction):
+				moves.append(Move(square_index(castle_rank,4),square_index(castle_rank,CASTLE_SQUARES[direction]["king_end_file"])))
+		return moves
 
 	def is_valid_position(self,position):
 		rank = position.rank
@@ -193,321 +547,251 @@ class Board:
 		else:
 			return False
 
-	def is_valid_move(self,piece,start,end):
-		if piece.type == "pawn":
-			return self.is_valid_move_pawn(start,end,piece)
-		elif piece.type == "rook":
-			return self.is_valid_move_rook(start,end,piece)
-		elif piece.type == "knight":
-			return self.is_valid_move_knight(start,end,piece)
-		elif piece.type == "bishop":
-			return self.is_valid_move_bishop(start,end,piece)
-		elif piece.type == "queen":
-			return self.is_valid_move_queen(start,end,piece)
-		elif piece.type == "king":
-			return self.is_valid_move_king(start,end,piece)
-		else:
-			raise NoPieceError(start,piece.color)
-
-	def is_valid_move_pawn(self,start,end,piece):
-		direction = get_direction(piece.color)
-		opponent_color = get_opponent_color(piece.color)
-
-		temp_position = Position(0,0)
-
-		temp_position.rank = start.rank+direction*1
-		temp_position.file = start.file
-		if self.is_valid_position(temp_position) and self.board[temp_position.rank,temp_position.file].piece.type == "nopiece" and end == temp_position:
-			return True
-
-		temp_position.rank = start.rank+direction*2
-		temp_position.file = start.file
-		if self.is_valid_position(temp_position) and self.board[temp_position.rank,temp_position.file].piece.type == "nopiece" and self.board[start.rank+direction*1,start.file].piece.type == "nopiece" and not piece.has_moved and end == temp_position:
-			return True
+	def is_valid_move(self,piece_type,color,start,end):
+		return (self.evaluate_legal_destinations(start,piece_type,color) >> end) & 1 == 1
 
-		temp_position.rank = start.rank+direction*1
-		temp_position.file = start.file-1
-		if self.is_valid_position(temp_position) and piece.id in self.board[temp_position.rank,temp_position.file].is_attacked_by[piece.color] and self.board[temp_position.rank,temp_position.file].piece.color == opponent_color and end == temp_position:
-			return True
-
-		temp_position.rank = start.rank+direction*1
-		temp_position.file = start.file+1
-		if self.is_valid_position(temp_position) and piece.id in self.board[temp_position.rank,temp_position.file].is_attacked_by[piece.color] and self.board[temp_position.rank,temp_position.file].piece.color == opponent_color and end == temp_position:
-			return True	
-
-		return False
+	def clear_check_states(self):
+		self.check_states = {
+			"white": None,
+			"black": None
+		}
 
-	def is_valid_move_rook(self,start,end,piece):
-		return piece.id in self.board[end.rank,end.file].is_attacked_by[piece.color]
+	def get_check_state(self,color):
+		if self.check_states[color] is None:
+			self.check_states[color] = CheckState(self,color)
+		return self.check_states[color]
+
+	def evaluate_legal_destinations(self,square,piece_type,color):
+		check_state = self.get_check_state(color)
+		destinations = check_state.destinations.get(square)
+		if destinations is None:
+			destinations = self.find_legal_destinations(square,piece_type,color,check_state)
+			check_state.destinations[square] = destinations
+		return destinations
+
+	def find_legal_destinations(self,square,piece_type,color,check_state):
+		if piece_type == "king":
+			return check_state.get_king_destinations(self)
+
+		destinations = self.evaluate_destinations(square,piece_type,color)
+		legal_squares = check_state.evasions
+		if (check_state.pinned >> square) & 1:
+			legal_squares &= check_state.pin_rays[square]
+		if piece_type == "pawn" and self.en_passant_square is not None and (destinations >> self.en_passant_square) & 1:
+			en_passant = 1 << self.en_passant_square
+			if self.is_legal_en_passant(square,color,check_state.king_square):
+				return (destinations & legal_squares) | en_passant
+			return destinations & legal_squares & ~en_passant
+		return destinations & legal_squares
+
+	def is_legal_en_passant(self,square,color,king_square):
+		captured_square = self.en_passant_square - 8*get_direction(color)
+		occupied = (self.occupancy["white"] | self.occupancy["black"] | (1 << self.en_passant_square)) & ~(1 << square) & ~(1 << captured_square)
+		return find_attackers(self,king_square,get_opponent_color(color),occupied) & ~(1 << captured_square) == 0
+
+	def evaluate_destinations(self,square,piece_type,color):
+		if piece_type == "pawn":
+			return self.evaluate_destinations_pawn(square,color)
+		elif piece_type == "king":
+			return self.evaluate_destinations_king(square,color)
+		else:
+			occupied = self.occupancy["white"] | self.occupancy["black"]
+			return self.evaluate_attacked_squares_piece(square,piece_type,color,occupied) & ~self.occupancy[color]
 
-	def is_valid_move_knight(self,start,end,piece):
-		return piece.id in self.board[end.rank,end.file].is_attacked_by[piece.color]
+	def evaluate_destinations_pawn(self,square,color):
+		direction = get_direction(color)
+		occupied = self.occupancy["white"] | self.occupancy["black"]
+		destinations = 0
 
-	def is_valid_move_bishop(self,start,end,piece):
-		return piece.id in self.board[end.rank,end.file].is_attacked_by[piece.color]
+		forward_square = square + 8*direction
+		if not (occupied >> forward_square) & 1:
+			destinations |= 1 << forward_square
+			double_square = forward_square + 8*direction
+			if square_rank(square) == get_pawn_rank(color) and not (occupied >> double_square) & 1:
+				destinations |= 1 << double_square
 
-	def is_valid_move_queen(self,start,end,piece):
-		return piece.id in self.board[end.rank,end.file].is_attacked_by[piece.color]
+		capture_targets = self.occupancy[get_opponent_color(color)]
+		if self.en_passant_square is not None:
+			capture_targets |= 1 << self.en_passant_square
+		return destinations | (self.evaluate_attacked_squares_pawn(square,color) & capture_targets)
 
-	def is_valid_move_king(self,start,end,piece):
-		opponent_color = get_opponent_color(piece.color)
-		return piece.id in self.board[end.rank,end.file].is_attacked_by[piece.color] and not self.board[end.rank,end.file].is_attacked_by[opponent_color]
+	def evaluate_destinations_king(self,square,color):
+		return self.evaluate_attacked_squares_king(square) & ~self.occupancy[color]
 
 	def take_piece(self,piece_to_take,piece_color):
-		if piece_to_take.type == "pawn":
-			self.pieces[piece_color]["pawns"] -= 1
-		elif piece_to_take.type == "rook":
-			self.pieces[piece_color]["rooks"] -= 1
-		elif piece_to_take.type == "knight":
-			self.pieces[piece_color]["knights"] -= 1
-		elif piece_to_take.type == "bishop":
-			self.pieces[piece_color]["bishops"] -= 1
-		elif piece_to_take.type == "queen":
-			self.pieces[piece_color]["queens"] -= 1
+		if piece_to_take != "king":
+			self.pieces[piece_color][piece_to_take + "s"] -= 1
 		self.turns_since_last_capture = 0
 
 	def is_checkmate(self,turn_color):
-		if self.is_check(turn_color):
-			king_color = "white"
-			if turn_color == "white":
-				king_color = "black"
-			king_position = self.king_positions[king_color]
-			king = self.board[king_position.rank,king_position.file]
-			position_shifts = [-1,0,1]
-			checkmate = True
-
-			temp_position = Position(0,0)
-
-			for rank_shift in position_shifts:
-				for file_shift in position_shifts:
-					temp_position.rank = king_position.rank+rank_shift
-					temp_position.file = king_position.file+file_shift
-					if king.id in self.board[rank,file].valid_moves:
-						checkmate = False
-						break
-			return checkmate
-		else:
-			return False
+		return self.is_check(turn_color) and not self.has_valid_moves(get_opponent_color(turn_color))
 
 	def is_check(self,turn_color):
-		king_color = get_opponent_color(turn_color)
-		king_position = self.king_positions[king_color]
-		return self.board[king_position.rank,king_position.file].is_attacked_by[turn_color]
+		return self.get_check_state(get_opponent_color(turn_color)).checkers != 0
+
+	def is_legal_setup(self):
+		pawns = self.bitboards["white"]["pawn"] | self.bitboards["black"]["pawn"]
+		return pawns & PROMOTION_RANKS == 0 and not self.is_check(self.turn_color)
 
 	def is_draw(self,turn_color):
-		return self.is_fifty_move_no_cap() or self.is_stalemate(turn_color) or self.is_three_move_repetition()
+		return self.is_fifty_move_no_cap() or self.is_stalemate(turn_color) or self.is_three_move_repetition() or self.is_tablebase_draw()
 
 	def is_fifty_move_no_cap(self):
 		return self.turns_since_last_capture >= 100
 
 	def is_stalemate(self,turn_color):
-		any_valid_moves = False
-		color_prefix = get_color_prefix(turn_color)
-		for rank in range(8):
-			for file in range(8):
-				if color_prefix in self.board[rank,file].valid_moves_color:
-					any_valid_moves = True
-		return not any_valid_moves and not self.is_check(get_opponent_color(turn_color))
+		return not self.is_check(get_opponent_color(turn_color)) and not self.has_valid_moves(turn_color)
 
-	def is_three_move_repetition(self):
-		return len(self.board_encodings) == 6 and self.board_encodings[0] == self.board_encodings[2] and self.board_encodings[0] == self.board_encodings[4] and self.board_encodings[1] == self.board_encodings[3] and self.board_encodings[1] == 5
+	def has_valid_moves(self,color):
+		for piece_type in PIECE_TYPES:
+			for square in iterate_squares(self.bitboards[color][piece_type]):
+				if self.evaluate_legal_destinations(square,piece_type,color):
+					return True
+		return False
 
-	def evaluate_valid_moves(self):
-		temp_position = Position(0,0)
-		temp_position2 = Position(0,0)
-		for rank in range(8):
-			for file in range(8):
-				self.board[rank,file].valid_moves = self.board[rank,file].is_attacked_by["white"] + self.board[rank,file].is_attacked_by["black"]
-				self.board[rank,file].valid_moves_color = []
-				if self.board[rank,file].is_attacked_by["white"] and not "w" in self.board[rank,file].valid_moves_color:
-					self.board[rank,file].valid_moves_color.append("w")
-				if self.board[rank,file].is_attacked_by["black"] and not "b" in self.board[rank,file].valid_moves_color:
-					self.board[rank,file].valid_moves_color.append("b")
-
-		for rank in range(8):
-			temp_position.rank = rank 
-			temp_position2.rank = rank
-			for file in range(8):
-				piece = self.board[rank,file].piece 
-				temp_position.file = file
+	def is_tablebase_draw(self):
+		return self.tablebase is not None and self.tablebase.is_draw(self)
 
-				if piece.type == "pawn":
-					temp_position2.file = file + get_direction(piece.color)*1
-					if self.is_valid_move_pawn(temp_position,temp_position2,piece):
-						self.board[temp_position2.rank,temp_position2.file].valid_moves.append(piece.id)
+	def is_tablebase_win(self,turn_color):
+		return self.tablebase is not None and self.tablebase.winner(self) == turn_color
 
-					if rank == 1 or rank == 6:
-						temp_position2.file = file + get_direction(piece.color)*2
-						if self.is_valid_move_pawn(temp_position,temp_position2,piece):
-							self.board[temp_position2.rank,temp_position2.file].valid_moves.append(piece.id)
-					
+	def is_three_move_repetition(self):
+		return self.position_counts.get(self.hash,0) >= 3
 
-	def evaluate_attacked_squares(self):
-		temp_position = Position(0,0)
-		for rank in range(8):
-			for file in range(8):
-				self.board[rank,file].is_attacked_by["white"] = []
-				self.board[rank,file].is_attacked_by["black"] = []
+	def repetition_count(self):
+		return self.position_counts.get(self.hash,0)
 
-		for rank in range(8):
-			temp_position.rank = rank 
-			for file in range(8):
-				piece = self.board[rank,file].piece 
-				temp_position.file = file 
-
-				if piece.type == "pawn":
-					self.evaluate_attacked_squares_pawn(temp_position,piece)
-				elif piece.type == "rook":
-					self.evaluate_attacked_squares_ranks_files(temp_position,piece)
-				elif piece.type == "knight":
-					self.evaluate_attacked_squares_knight(temp_position,piece)
-				elif piece.type == "bishop":
-					self.evaluate_attacked_squares_diagonals(temp_position,piece)
-				elif piece.type == "queen":
-					self.evaluate_attacked_squares_ranks_files(temp_position,piece)
-					self.evaluate_attacked_squares_diagonals(temp_position,piece)
-				elif piece.type == "king":
-					self.evaluate_attacked_squares_king(temp_position,piece)
-
-	def evaluate_attacked_squares_pawn(self,position,piece):
-		temp_position = Position(0,0)
-		direction = get_direction(piece.color)
-
-		temp_position.rank = position.rank+direction*1
-		temp_position.file = position.file+1
-		if self.is_valid_position(temp_position):
-			self.board[temp_position.rank,temp_position.file].is_attacked_by[piece.color].append(piece.id)
-
-		temp_position.rank = position.rank+direction*1
-		temp_position.file = position.file-1
-		if self.is_valid_position(temp_position):
-			self.board[temp_position.rank,temp_position.file].is_attacked_by[piece.color].append(piece.id)
-
-	def evaluate_attacked_squares_ranks_files(self,position,piece):
-		temp_position = Position(0,0)
-
-		for rank in range(1,8):
-			temp_position.rank = position.rank+rank
-			temp_position.file = position.file
-			if not self.determine_attackability(piece,temp_position):
-				break
-
-		for rank in range(1,8):
-			temp_position.rank = position.rank-rank
-			temp_position.file = position.file
-			if not self.determine_attackability(piece,temp_position):
-				break
-
-		for file in range(1,8):
-			temp_position.rank = position.rank
-			temp_position.file = position.file+file
-			if not self.determine_attackability(piece,temp_position):
-				break
-
-		for file in range(1,8):
-			temp_position.rank = position.rank
-			temp_position.file = position.file-file
-			if not self.determine_attackability(piece,temp_position):
-				break
-
-	def evaluate_attacked_squares_knight(self,position,piece):
-		temp_position = Position(0,0) 
-		shifts = [(-2,-1),(-2,1),(-1,-2),(-1,2),(1,-2),(1,2),(2,-1),(2,1)]
-
-		for shift in shifts:
-			temp_position.rank = position.rank+shift[0]
-			temp_position.file = position.file+shift[1]
-			if self.is_valid_position(temp_position) and self.board[temp_position.rank,temp_position.file].piece.color != piece.color:
-				self.board[temp_position.rank,temp_position.file].is_attacked_by[piece.color].append(piece.id)
-
-	def evaluate_attacked_squares_diagonals(self,position,piece):
-		temp_position = Position(0,0) 
-
-		for rank in range(1,8):
-			temp_position.rank = position.rank+rank
-			temp_position.file = position.file+rank
-			if not self.determine_attackability(piece,temp_position):
-				break
-
-		for rank in range(1,8):
-			temp_position.rank = position.rank-rank
-			temp_position.file = position.file-rank
-			if not self.determine_attackability(piece,temp_position):
-				break
-
-		for file in range(1,8):
-			temp_position.rank = position.rank-file
-			temp_position.file = position.file+file
-			if not self.determine_attackability(piece,temp_position):
-				break
-
-		for file in range(1,8):
-			temp_position.rank = position.rank+file
-			temp_position.file = position.file-file
-			if not self.determine_attackability(piece,temp_position):
-				break
-			
-	def determine_attackability(self,piece,position):
-		if self.is_valid_position(position):
-			temp_piece = self.board[position.rank,position.file].piece
-			if temp_piece.type == "nopiece":
-				self.board[position.rank,position.file].is_attacked_by[piece.color].append(piece.id)
-				return True
-			elif temp_piece.color != piece.color:
-				self.board[position.rank,position.file].is_attacked_by[piece.color].append(piece.id)
-				return False
-			elif temp_piece.color == piece.color:
-				return False
+	def evaluate_attacked_squares(self):
+		occupied = self.occupancy["white"] | self.occupancy["black"]
+		self.attacks_from = [0]*64
+		for color in COLORS:
+			for piece_type in PIECE_TYPES:
+				for square in iterate_squares(self.bitboards[color][piece_type]):
+					self.attacks_from[square] = self.evaluate_attacked_squares_piece(square,piece_type,color,occupied)
+		self.combine_attacked_squares()
+
+	def mark_attacks_dirty(self,changed_squares):
+		self.stale_attack_squares |= changed_squares
+		self.attacks_dirty = True
+
+	def get_attacked_squares(self,color):
+		if self.attacks_dirty:
+			self.update_attacked_squares(self.stale_attack_squares)
+			self.stale_attack_squares = 0
+			self.attacks_dirty = False
+		return self.attacked_squares[color]
+
+	def is_square_attacked(self,square,color):
+		return find_attackers(self,square,color,self.occupancy["white"] | self.occupancy["black"]) != 0
+
+	def update_attacked_squares(self,changed_squares):
+		occupied = self.occupancy["white"] | self.occupancy["black"]
+		for square in iterate_squares(changed_squares):
+			self.attacks_from[square] = self.evaluate_attacked_squares_square(square,occupied)
+
+		sliders = 0
+		for color in COLORS:
+			for piece_type in SLIDER_TYPES:
+				sliders |= self.bitboards[color][piece_type]
+		for square in iterate_squares(sliders & ~changed_squares):
+			if self.attacks_from[square] & changed_squares:
+				self.attacks_from[square] = self.evaluate_attacked_squares_square(square,occupied)
+
+		self.combine_attacked_squares()
+		if self.debug_attacks:
+			self.verify_attacked_squares()
+
+	def combine_attacked_squares(self):
+		for color in COLORS:
+			attacked_squares = 0
+			for square in iterate_squares(self.occupancy[color]):
+				attacked_squares |= self.attacks_from[square]
+			self.attacked_squares[color] = attacked_squares
+
+	def verify_attacked_squares(self):
+		incremental_attacks_from = self.attacks_from
+		self.evaluate_attacked_squares()
+		for square in range(64):
+			if incremental_attacks_from[square] != self.attacks_from[square]:
+				raise AttackMapMismatchError(square_to_position(square))
+
+	def evaluate_attacked_squares_square(self,square,occupied):
+		occupant = self.piece_at(square)
+		if occupant is not None:
+			color, piece_type = occupant
+			return self.evaluate_attacked_squares_piece(square,piece_type,color,occupied)
 		else:
-			return False
+			return 0
+
+	def evaluate_attacked_squares_piece(self,square,piece_type,color,occupied):
+		if piece_type == "pawn":
+			return self.evaluate_attacked_squares_pawn(square,color)
+		elif piece_type == "rook":
+			return self.evaluate_attacked_squares_ranks_files(square,occupied)
+		elif piece_type == "knight":
+			return self.evaluate_attacked_squares_knight(square)
+		elif piece_type == "bishop":
+			return self.evaluate_attacked_squares_diagonals(square,occupied)
+		elif piece_type == "queen":
+			return self.evaluate_attacked_squares_ranks_files(square,occupied) | self.evaluate_attacked_squares_diagonals(square,occupied)
+		else:
+			return self.evaluate_attacked_squares_king(square)
 
-	def evaluate_attacked_squares_king(self,position,piece):
-		temp_position = Position(0,0) 
-		shifts = [(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,0)]
-		opponent_color = get_opponent_color(piece.color)
+	def evaluate_attacked_squares_pawn(self,square,color):
+		return PAWN_ATTACKS[color][square]
 
-		for shift in shifts:
-			temp_position.rank = position.rank+shift[0]
-			temp_position.file = position.file+shift[1]
-			if self.is_valid_position(temp_position) and self.board[temp_position.rank,temp_position.file].piece.color != piece.color and not self.board[temp_position.rank,temp_position.file].is_attacked_by[opponent_color]:
-				self.board[temp_position.rank,temp_position.file].is_attacked_by[piece.color].append(piece.id)
+	def evaluate_attacked_squares_ranks_files(self,square,occupied):
+		return rook_attacks(square,occupied)
 
-	def update_board_encodings(self):
-		encoded_board = self.encode_board()
-		self.board_encodings.append(encoded_board)
-		self.board_encodings = self.board_encodings[1:]
+	def evaluate_attacked_squares_diagonals(self,square,occupied):
+		return bishop_attacks(square,occupied)
 
-	def encode_board(self):
-		encoded_board = ""
-		for rank in range(8):
-			for file in range(8):
-				encoded_board += str(self.board[rank,file])
-			encoded_board += "/"
+	def evaluate_attacked_squares_knight(self,square):
+		return KNIGHT_ATTACKS[square]
 
+	def evaluate_attacked_squares_king(self,square):
+		return KING_ATTACKS[square]
 
-	def clear_en_pessantability(self,turn_color):
-		en_pessant_rank = 2
-		if turn_color == "black":
-			en_pessant_rank = 5
-		for file in range(8):
-			self.board[en_pessant_rank,file].is_en_pessantable_by[turn_color] = False
+	def encode_board(self):
+		return self.hash
 
 	def unhighlight_squares(self):
-		for rank in range(8):
-			for file in range(8):
-				self.board[rank,file].is_highlighted = False
+		if self.highlighted:
+			self.highlighted = 0
+			self.board_view = None
 
 	def get_opponent_color(self, turn_color):
 		if turn_color == "white":
 			return "black"
-		else: 
+		else:
 			return "white"
 
 	def get_pawn_direction(self, turn_color):
 		if turn_color == "white":
 			return 1
-		else: 
+		else:
 			return -1
 
 	def reset(self):
-		self.__init__()
\ No newline at end of file
+		tablebase = self.tablebase
+		self.__init__()
+		self.tablebase = tablebase
+
+def validate_fen(fen):
+	fields = fen.split()
+	if len(fields) < 4 or len(fields) > 6:
+		raise InvalidFENError(fen)
+	ranks = fields[0].split("/")
+	if len(ranks) != 8:
+		raise InvalidFENError(fen)
+	for rank_text in ranks:
+		if not FEN_RANK_REGEX.match(rank_text) or sum(int(character) if character.isdigit() else 1 for character in rank_text) != 8:
+			raise InvalidFENError(fen)
+	if fields[0].count("K") != 1 or fields[0].count("k") != 1:
+		raise InvalidFENError(fen)
+	if fields[1] not in ("w","b") or not FEN_CASTLING_REGEX.match(fields[2]) or not FEN_EN_PASSANT_REGEX.match(fields[3]):
+		raise InvalidFENError(fen)
+	for counter in fields[4:]:
+		if not counter.isdigit():
+			raise InvalidFENError(fen)
+	return fields
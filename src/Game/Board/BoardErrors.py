@@ -21,10 +21,6 @@ class InvalidPositionError(Exception):
 	def __init__(self,position):
 		self.position = convert_coordinate_to_position(position)
 
-class InvalidPieceCheckError(Exception):
-	def __init__(self,piece_type):
-		self.piece_type = piece_type
-
 class InvalidPromotionTypeError(Exception):
 	def __init__(self,start,end):
 		self.start_position = convert_coordinate_to_position(start)
@@ -34,5 +30,21 @@ class InvalidCastleError(Exception):
 	def __init__(self,color):
 		self.color = color
 
+class InvalidNotationError(Exception):
+	def __init__(self,notation):
+		self.notation = notation
+
+class InvalidFENError(Exception):
+	def __init__(self,fen):
+		self.fen = fen
+
+class InvalidPositionRecordError(Exception):
+	def __init__(self,record):
+		self.record = record
+
+class AttackMapMismatchError(Exception):
+	def __init__(self,position):
+		self.position = convert_coordinate_to_position(position)
+
 def convert_coordinate_to_position(position):
 	return chr(position.file+97) + str(position.rank+1)
\ No newline at end of file
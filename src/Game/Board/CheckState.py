@@ -0,0 +1,60 @@
+from .AttackTables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN, rook_attacks, bishop_attacks
+from .Bitboard import iterate_squares, first_square
+from ..Utils import get_opponent_color
+
+ALL_SQUARES = (1 << 64) - 1
+
+class CheckState:
+	__slots__ = ("color","king_square","checkers","pinned","pin_rays","evasions","king_destinations","destinations")
+
+	def __init__(self,board,color):
+		opponent_color = get_opponent_color(color)
+		enemy = board.bitboards[opponent_color]
+		occupied = board.occupancy["white"] | board.occupancy["black"]
+		rook_sliders = enemy["rook"] | enemy["queen"]
+		bishop_sliders = enemy["bishop"] | enemy["queen"]
+		king_square = first_square(board.bitboards[color]["king"])
+		self.color = color
+		self.king_square = king_square
+		self.checkers = find_attackers(board,king_square,opponent_color,occupied)
+
+		self.pinned = 0
+		self.pin_rays = {}
+		pinners = (rook_attacks(king_square,board.occupancy[opponent_color]) & rook_sliders) | (bishop_attacks(king_square,board.occupancy[opponent_color]) & bishop_sliders)
+		for pinner in iterate_squares(pinners & ~self.checkers):
+			blockers = BETWEEN[king_square][pinner] & occupied
+			if blockers.bit_count() == 1:
+				self.pinned |= blockers
+				self.pin_rays[first_square(blockers)] = BETWEEN[king_square][pinner] | (1 << pinner)
+
+		checker_count = self.checkers.bit_count()
+		if checker_count == 0:
+			self.evasions = ALL_SQUARES
+		elif checker_count == 1:
+			self.evasions = BETWEEN[king_square][first_square(self.checkers)] | self.checkers
+		else:
+			self.evasions = 0
+		self.king_destinations = None
+		self.destinations = {}
+
+	def get_king_destinations(self,board):
+		if self.king_destinations is None:
+			opponent_color = get_opponent_color(self.color)
+			enemy = board.bitboards[opponent_color]
+			attacked = board.get_attacked_squares(opponent_color)
+			occupied_without_king = (board.occupancy["white"] | board.occupancy["black"]) & ~(1 << self.king_square)
+			for checker in iterate_squares(self.checkers & (enemy["rook"] | enemy["queen"])):
+				attacked |= rook_attacks(checker,occupied_without_king)
+			for checker in iterate_squares(self.checkers & (enemy["bishop"] | enemy["queen"])):
+				attacked |= bishop_attacks(checker,occupied_without_king)
+			self.king_destinations = KING_ATTACKS[self.king_square] & ~board.occupancy[self.color] & ~attacked
+		return self.king_destinations
+
+def find_attackers(board,square,color,occupied):
+	pieces = board.bitboards[color]
+	attackers = PAWN_ATTACKS[get_opponent_color(color)][square] & pieces["pawn"]
+	attackers |= KNIGHT_ATTACKS[square] & pieces["knight"]
+	attackers |= KING_ATTACKS[square] & pieces["king"]
+	attackers |= rook_attacks(square,occupied) & (pieces["rook"] | pieces["queen"])
+	attackers |= bishop_attacks(square,occupied) & (pieces["bishop"] | pieces["queen"])
+	return attackers
@@ -0,0 +1,46 @@
+from .Bitboard import square_name
+
+PROMOTION_LETTERS = {
+	"queen": "q",
+	"rook": "r",
+	"knight": "n",
+	"bishop": "b"
+}
+PROMOTION_CODES = {
+	None: 0,
+	"queen": 1,
+	"rook": 2,
+	"knight": 3,
+	"bishop": 4
+}
+PROMOTION_TYPES_BY_CODE = (None,"queen","rook","knight","bishop")
+
+class Move:
+	__slots__ = ("start","end","promotion_type")
+
+	def __init__(self,start,end,promotion_type=None):
+		self.start = start
+		self.end = end
+		self.promotion_type = promotion_type
+
+	@classmethod
+	def from_int(cls,encoded_move):
+		return cls(encoded_move & 63,(encoded_move >> 6) & 63,PROMOTION_TYPES_BY_CODE[encoded_move >> 12])
+
+	def to_int(self):
+		return self.start | (self.end << 6) | (PROMOTION_CODES[self.promotion_type] << 12)
+
+	def __eq__(self,other):
+		return isinstance(other,Move) and (self.start,self.end,self.promotion_type) == (other.start,other.end,other.promotion_type)
+
+	def __hash__(self):
+		return hash((self.start,self.end,self.promotion_type))
+
+	def __str__(self):
+		move_string = square_name(self.start) + square_name(self.end)
+		if self.promotion_type is not None:
+			move_string += PROMOTION_LETTERS[self.promotion_type]
+		return move_string
+
+	def __repr__(self):
+		return "Move(" + str(self) + ")"
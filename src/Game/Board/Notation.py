@@ -0,0 +1,94 @@
+from .Move import Move
+from .BoardErrors import InvalidNotationError
+from .Bitboard import square_index, square_rank, square_file, iterate_squares
+from ..Utils import get_castle_rank
+import re
+
+SAN_REGEX = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h])([1-8])(?:=?([NBRQ]))?$")
+UCI_MOVE_REGEX = re.compile("^([a-h][1-8])([a-h][1-8])([qrbn])?$")
+UCI_PROMOTION_TYPES = {
+	None: None,
+	"q": "queen",
+	"r": "rook",
+	"b": "bishop",
+	"n": "knight"
+}
+SAN_PIECE_TYPES = {
+	None: "pawn",
+	"N": "knight",
+	"B": "bishop",
+	"R": "rook",
+	"Q": "queen",
+	"K": "king"
+}
+SAN_PROMOTION_TYPES = {
+	None: None,
+	"N": "knight",
+	"B": "bishop",
+	"R": "rook",
+	"Q": "queen"
+}
+CASTLING_NOTATION = {
+	"O-O": ("short",6),
+	"0-0": ("short",6),
+	"O-O-O": ("long",2),
+	"0-0-0": ("long",2)
+}
+
+def parse_san(board,san):
+	notation = san.rstrip("+#!?")
+	turn_color = board.turn_color
+
+	if notation in CASTLING_NOTATION:
+		direction, king_end_file = CASTLING_NOTATION[notation]
+		castle_rank = get_castle_rank(turn_color)
+		if board.can_castle(turn_color,direction):
+			return Move(square_index(castle_rank,4),square_index(castle_rank,king_end_file))
+		raise InvalidNotationError(san)
+
+	match = SAN_REGEX.match(notation)
+	if match is None:
+		raise InvalidNotationError(san)
+	piece_letter, start_file, start_rank, end_file, end_rank, promotion_letter = match.groups()
+	piece_type = SAN_PIECE_TYPES[piece_letter]
+	promotion_type = SAN_PROMOTION_TYPES[promotion_letter]
+	end = square_index(int(end_rank)-1,ord(end_file)-97)
+	if (piece_type == "pawn" and end_rank in "18") != (promotion_type is not None):
+		raise InvalidNotationError(san)
+
+	candidates = []
+	for start in iterate_squares(board.bitboards[turn_color][piece_type]):
+		if start_file is not None and square_file(start) != ord(start_file)-97:
+			continue
+		if start_rank is not None and square_rank(start) != int(start_rank)-1:
+			continue
+		if board.is_valid_move(piece_type,turn_color,start,end):
+			candidates.append(Move(start,end,promotion_type))
+
+	if len(candidates) != 1:
+		raise InvalidNotationError(san)
+	return candidates[0]
+
+def parse_uci_move(board,notation):
+	match = UCI_MOVE_REGEX.match(notation)
+	if match is None:
+		raise InvalidNotationError(notation)
+	start_name, end_name, promotion_letter = match.groups()
+	start = square_index(int(start_name[1])-1,ord(start_name[0])-97)
+	end = square_index(int(end_name[1])-1,ord(end_name[0])-97)
+	move = Move(start,end,UCI_PROMOTION_TYPES[promotion_letter])
+	turn_color = board.turn_color
+	piece_type = board.piece_type_at(start,turn_color)
+	if piece_type is None:
+		raise InvalidNotationError(notation)
+	if (piece_type == "pawn" and (end >> 3) in (0,7)) != (move.promotion_type is not None):
+		raise InvalidNotationError(notation)
+
+	if piece_type == "king" and abs(end-start) == 2:
+		castle_rank = get_castle_rank(turn_color)
+		direction = "short" if end > start else "long"
+		if start != square_index(castle_rank,4) or not board.can_castle(turn_color,direction):
+			raise InvalidNotationError(notation)
+	elif not board.is_valid_move(piece_type,turn_color,start,end):
+		raise InvalidNotationError(notation)
+	return move
@@ -0,0 +1,75 @@
+from .Board import Board
+from time import perf_counter
+
+PERFT_POSITIONS = [
+	{
+		"name": "start",
+		"fen": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+		"nodes": [20,400,8902,197281,4865609]
+	},
+	{
+		"name": "kiwipete",
+		"fen": "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+		"nodes": [48,2039,97862,4085603]
+	},
+	{
+		"name": "endgame",
+		"fen": "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+		"nodes": [14,191,2812,43238,674624]
+	},
+	{
+		"name": "promotions",
+		"fen": "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+		"nodes": [6,264,9467,422333]
+	},
+	{
+		"name": "discovered_checks",
+		"fen": "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+		"nodes": [44,1486,62379,2103487]
+	},
+	{
+		"name": "middlegame",
+		"fen": "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+		"nodes": [46,2079,89890,3894594]
+	}
+]
+
+def perft_divide(board,depth):
+	divide = {}
+	for move in board.legal_moves():
+		board.push(move)
+		divide[str(move)] = board.perft(depth-1)
+		board.pop()
+	return divide
+
+def run_perft_suite(max_depth):
+	all_passed = True
+	total_nodes = 0
+	total_time = 0.0
+
+	for position in PERFT_POSITIONS:
+		board = Board.from_fen(position["fen"])
+		for depth in range(1,min(max_depth,len(position["nodes"]))+1):
+			expected_nodes = position["nodes"][depth-1]
+			start_time = perf_counter()
+			nodes = board.perft(depth)
+			elapsed = perf_counter() - start_time
+
+			total_nodes += nodes
+			total_time += elapsed
+			passed = nodes == expected_nodes
+			all_passed = all_passed and passed
+			print(format_perft_result(position["name"],depth,nodes,expected_nodes,elapsed,passed))
+
+	print("Total: " + str(total_nodes) + " nodes in " + format(total_time,".3f") + "s (" + format_nodes_per_second(total_nodes,total_time) + " nodes/s)")
+	return all_passed
+
+def format_perft_result(name,depth,nodes,expected_nodes,elapsed,passed):
+	status = "ok" if passed else "FAIL (expected " + str(expected_nodes) + ")"
+	return name.ljust(18) + " depth " + str(depth) + ": " + str(nodes).rjust(9) + " nodes " + format(elapsed,".3f").rjust(9) + "s " + format_nodes_per_second(nodes,elapsed).rjust(9) + " nodes/s " + status
+
+def format_nodes_per_second(nodes,elapsed):
+	if elapsed > 0:
+		return str(int(nodes/elapsed))
+	else:
+		return "-"
@@ -1,6 +1,34 @@
+from .Bitboard import COLORS, PIECE_TYPES
+
+EMPTY_PIECE_CODE = 15
+PIECE_ID_LETTERS = ("p","N","B","R","Q","K")
+
 class Piece:
-	def __init__(self,piece_type,color,unique_id):
+	__slots__ = ("type","color","code","id")
+
+	def __init__(self,piece_type,color,code,unique_id):
 		self.type = piece_type
 		self.color = color
-		self.has_moved = False
-		self.id = unique_id
\ No newline at end of file
+		self.code = code
+		self.id = unique_id
+
+def get_piece_code(color,piece_type):
+	return (COLORS.index(color) << 3) | PIECE_TYPES.index(piece_type)
+
+def get_piece(color,piece_type):
+	return PIECES[get_piece_code(color,piece_type)]
+
+def build_piece_symbols(white_symbols,black_symbols,empty_symbol):
+	symbols = [empty_symbol]*16
+	for type_index in range(len(PIECE_TYPES)):
+		symbols[type_index] = white_symbols[type_index]
+		symbols[8 + type_index] = black_symbols[type_index]
+	return tuple(symbols)
+
+EMPTY_PIECE = Piece("nopiece","none",EMPTY_PIECE_CODE,"np")
+PIECES = [EMPTY_PIECE]*16
+for color in COLORS:
+	for type_index, piece_type in enumerate(PIECE_TYPES):
+		code = get_piece_code(color,piece_type)
+		PIECES[code] = Piece(piece_type,color,code,color[0] + PIECE_ID_LETTERS[type_index])
+PIECES = tuple(PIECES)
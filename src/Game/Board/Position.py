@@ -1,10 +1,31 @@
+INTERNED_POSITIONS = ()
+
 class Position:
-	def __init__(self,rank,file):
-		self.rank = int(rank)
-		self.file = int(file)
+	__slots__ = ("rank","file")
+
+	def __new__(cls,rank,file):
+		rank = int(rank)
+		file = int(file)
+		if INTERNED_POSITIONS and 0 <= rank < 8 and 0 <= file < 8:
+			return INTERNED_POSITIONS[rank*8 + file]
+		position = object.__new__(cls)
+		object.__setattr__(position,"rank",rank)
+		object.__setattr__(position,"file",file)
+		return position
+
+	def __setattr__(self,name,value):
+		raise AttributeError("Position is immutable")
+
+	def __reduce__(self):
+		return (Position,(self.rank,self.file))
 
 	def __eq__(self,other):
-		return (self.rank,self.file) == (other.rank,other.file)
+		return self is other or (isinstance(other,Position) and (self.rank,self.file) == (other.rank,other.file))
+
+	def __hash__(self):
+		return hash((self.rank,self.file))
 
 	def __str__(self):
-		return "(" + str(self.rank) + "," + str(self.file) + ")"
\ No newline at end of file
+		return "(" + str(self.rank) + "," + str(self.file) + ")"
+
+INTERNED_POSITIONS = tuple(Position(square >> 3,square & 7) for square in range(64))
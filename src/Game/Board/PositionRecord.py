@@ -0,0 +1,83 @@
+from .Board import Board
+from .Bitboard import COLORS, PIECE_TYPES, iterate_squares
+from .BoardErrors import InvalidPositionRecordError
+from .Piece import EMPTY_PIECE_CODE
+import numpy as np
+import struct
+
+POSITION_RECORD = struct.Struct("<Q16sBBBH3x")
+RECORD_SIZE = POSITION_RECORD.size
+NO_EN_PASSANT = 0xFF
+RECORD_DTYPE = np.dtype([("occupied","<u8"),("piece_codes","u1",16),("flags","u1"),("en_passant","u1"),("halfmove","u1"),("fullmove","<u2"),("padding","V3")])
+CASTLING_FLAGS = (("white","short",2),("white","long",4),("black","short",8),("black","long",16))
+
+def encode_position(board):
+	occupied = board.occupancy["white"] | board.occupancy["black"]
+	piece_codes = bytearray(16)
+	for index, square in enumerate(iterate_squares(occupied)):
+		color, piece_type = board.piece_at(square)
+		piece_code = (COLORS.index(color) << 3) | PIECE_TYPES.index(piece_type)
+		piece_codes[index >> 1] |= piece_code << (4*(index & 1))
+
+	flags = 1 if board.turn_color == "black" else 0
+	for color, direction, flag in CASTLING_FLAGS:
+		if board.castling_rights[color][direction]:
+			flags |= flag
+	en_passant = board.en_passant_square if board.en_passant_square is not None else NO_EN_PASSANT
+	return POSITION_RECORD.pack(occupied,bytes(piece_codes),flags,en_passant,min(board.turns_since_last_capture,0xFF),min(board.fullmove_number,0xFFFF))
+
+def decode_position(record,board=None):
+	if board is None:
+		board = Board()
+	if len(record) != RECORD_SIZE:
+		raise InvalidPositionRecordError(record)
+	return load_position_fields(board,POSITION_RECORD.unpack(record))
+
+def encode_positions(boards):
+	return b"".join(encode_position(board) for board in boards)
+
+def decode_positions(data):
+	if len(data) % RECORD_SIZE != 0:
+		raise InvalidPositionRecordError(data)
+	return [load_position_fields(Board(),fields) for fields in POSITION_RECORD.iter_unpack(data)]
+
+def decode_position_codes(data):
+	if len(data) % RECORD_SIZE != 0:
+		raise InvalidPositionRecordError(data)
+	records = np.frombuffer(data,dtype=RECORD_DTYPE)
+	occupied = (records["occupied"][:,None] >> np.arange(64,dtype=np.uint64)) & 1 == 1
+	nibbles = np.empty((len(records),32),dtype=np.int8)
+	nibbles[:,0::2] = records["piece_codes"] & 0xF
+	nibbles[:,1::2] = records["piece_codes"] >> 4
+	order = np.clip(np.cumsum(occupied,axis=1) - 1,0,31)
+	codes = np.where(occupied,np.take_along_axis(nibbles,order,axis=1),EMPTY_PIECE_CODE).astype(np.int8)
+	return codes, records["flags"] & 1 == 1
+
+def load_position_fields(board,fields):
+	occupied, piece_codes, flags, en_passant, turns_since_last_capture, fullmove_number = fields
+	if occupied.bit_count() > 32:
+		raise InvalidPositionRecordError(fields)
+	board.clear_pieces()
+	for index, square in enumerate(iterate_squares(occupied)):
+		piece_code = (piece_codes[index >> 1] >> (4*(index & 1))) & 0xF
+		if piece_code & 7 >= len(PIECE_TYPES):
+			raise InvalidPositionRecordError(fields)
+		board.place_piece(square,PIECE_TYPES[piece_code & 7],COLORS[piece_code >> 3])
+	for color in COLORS:
+		if board.bitboards[color]["king"].bit_count() != 1:
+			raise InvalidPositionRecordError(fields)
+
+	board.turn_color = "black" if flags & 1 else "white"
+	board.castling_rights = {
+		"white": {},
+		"black": {}
+	}
+	for color, direction, flag in CASTLING_FLAGS:
+		board.castling_rights[color][direction] = bool(flags & flag)
+	board.en_passant_square = en_passant if en_passant != NO_EN_PASSANT else None
+	board.turns_since_last_capture = turns_since_last_capture
+	board.fullmove_number = max(fullmove_number,1)
+	board.finish_loading()
+	if not board.is_legal_setup():
+		raise InvalidPositionRecordError(fields)
+	return board
@@ -1,19 +1,22 @@
+from .Position import INTERNED_POSITIONS
+
 class Square:
-	def __init__(self,position,piece):
+	__slots__ = ("position","piece","is_highlighted")
+
+	def __init__(self,position,piece,is_highlighted=False):
 		self.position = position
 		self.piece = piece
-		self.is_en_pessantable_by = {
-			"white": False,
-			"black": False
-		}
-		self.is_attacked_by = {
-			"white": [],
-			"black": []
-		}
-		self.valid_moves = []
-		self.valid_moves_color = []
-		self.is_highlighted = False
+		self.is_highlighted = is_highlighted
 
 	def __str__(self):
-		return "[" + str(self.position) + ":" + self.piece.id + ":" + str(self.is_en_pessantable_by["white"]) + ":" + str(self.is_en_pessantable_by["white"]) + "]"
-		
\ No newline at end of file
+		return "[" + str(self.position) + ":" + self.piece.id + ":" + str(self.is_highlighted) + "]"
+
+INTERNED_SQUARES = {}
+
+def get_square(square,piece,is_highlighted):
+	key = (square << 5) | (piece.code << 1) | is_highlighted
+	interned_square = INTERNED_SQUARES.get(key)
+	if interned_square is None:
+		interned_square = Square(INTERNED_POSITIONS[square],piece,is_highlighted)
+		INTERNED_SQUARES[key] = interned_square
+	return interned_square
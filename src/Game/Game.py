@@ -1,24 +1,46 @@
 from .Board.Board import Board
-from .Board.BoardErrors import InvalidPositionError, NoPieceError, EmptySquareError, SameSquareError, InvalidMoveError, InvalidPieceCheckError, InvalidCastleError
-from .Board.Position import Position
+from .Board.BoardErrors import InvalidPositionError, NoPieceError, EmptySquareError, SameSquareError, InvalidMoveError, InvalidPromotionTypeError, InvalidCastleError
 from .InputErrors import InvalidInputError, InvalidCastleInputError, DeclinedDrawError
-from .Utils import get_opponent_color
+from .Utils import get_opponent_color, convert_input_to_position
+from .Renderer import BoardRenderer
+from ..Engine.Search import Search, MAX_DEPTH
+from ..Engine.ParallelSearch import ParallelSearch
+from ..Engine.Evaluation import evaluate
+from ..Engine.OpeningBook import format_book_moves
+from .Profiler import BOARD_PROFILED_METHODS, GAME_PROFILED_METHODS, ENGINE_PROFILED_METHODS
 import re
-from os import system
 from sys import stdout
 
+INPUT_ERRORS = (InvalidInputError,InvalidPositionError,NoPieceError,EmptySquareError,SameSquareError,InvalidMoveError,InvalidPromotionTypeError,InvalidCastleInputError,InvalidCastleError,DeclinedDrawError)
+
 class Game:
-	def __init__(self,piece_display_type):
+	def __init__(self,piece_display_type,engine_color=None,engine_depth=MAX_DEPTH,engine_movetime=None,engine_threads=1,book=None,tablebase=None,profiler=None):
 		self.board = Board()
+		self.board.tablebase = tablebase
+		self.book = book
 		self.piece_display_type = piece_display_type
+		self.engine_color = engine_color
+		self.engine_depth = engine_depth
+		self.engine_movetime = engine_movetime
+		self.engine = None
+		if engine_color is not None:
+			if engine_threads > 1:
+				self.engine = ParallelSearch(self.board,engine_threads)
+			else:
+				self.engine = Search(self.board)
+		self.engine_report = None
+		self.book_report = None
 		stdout.reconfigure(encoding="utf-8")
+		self.renderer = BoardRenderer(piece_display_type)
+		self.profiler = profiler
+		if profiler is not None:
+			profiler.instrument(self.board,BOARD_PROFILED_METHODS,"Board")
+			profiler.instrument(self,GAME_PROFILED_METHODS,"Game")
+			if self.engine is not None:
+				profiler.instrument(self.engine,ENGINE_PROFILED_METHODS,"Engine")
 
 	def play(self):
-		self.game_end = False
-		self.check_status = False
-		self.checkmate_status = False
-		self.resign_status = False
-		self.draw_status = False
+		self.reset_status()
 
 		while not self.game_end:
 			self.turn("white")
@@ -26,11 +48,27 @@ class Game:
 			if not self.game_end:
 				self.turn("black")
 
+		if self.engine is not None:
+			self.engine.close()
+		if self.profiler is not None:
+			self.profiler.finish_game()
+
+	def reset_status(self):
+		self.game_end = False
+		self.check_status = False
+		self.checkmate_status = False
+		self.resign_status = False
+		self.draw_status = False
+
 	def turn(self,turn_color):
-		opponent_color = get_opponent_color(turn_color)
 		turn_complete = False
 		while not turn_complete:
 			self.display_board()
+			if self.engine_report is not None:
+				self.write(self.engine_report + "\n")
+			if self.book_report is not None:
+				self.write(self.book_report + "\n")
+				self.book_report = None
 			self.board.unhighlight_squares()
 
 			if self.draw_status or self.board.is_draw(turn_color):
@@ -41,19 +79,28 @@ class Game:
 				if self.check_status:
 					self.warn_check(turn_color)
 
-				turn_complete = self.move(turn_color)
+				if turn_color == self.engine_color:
+					turn_complete = self.engine_move(turn_color)
+				else:
+					turn_complete = self.move(turn_color)
 
 				if turn_complete:
-					if self.resign_status:
-						self.game_end = True
-						self.resignation(opponent_color)
+					self.finish_turn(turn_color)
+
+				self.check_status = self.board.is_check(turn_color)
 
-					self.checkmate_status = self.board.is_checkmate(turn_color)
-					if self.checkmate_status:
-						self.game_end = True
-						self.checkmate(turn_color)
+	def finish_turn(self,turn_color):
+		if self.resign_status:
+			self.game_end = True
+			self.resignation(get_opponent_color(turn_color))
 
-				self.check_status = self.board.is_check(opponent_color)
+		self.checkmate_status = self.board.is_checkmate(turn_color)
+		if self.checkmate_status:
+			self.game_end = True
+			self.checkmate(turn_color)
+		elif not self.game_end and self.board.is_tablebase_win(turn_color):
+			self.game_end = True
+			self.tablebase_win(turn_color)
 
 	def move(self,turn_color):
 		end_of_turn = False
@@ -61,30 +108,31 @@ class Game:
 			try:
 				end_of_turn = self.attempt_move(turn_color)
 				break
-			except InvalidInputError as e:
-				print("Invalid input. Correct format \"startsquare endsquare\", \"startsquare endsquare promotiontype\", \"castle direction\", \"resign\", \"?square\", or \"draw?\". Exs: \"a2 a4\", \"a7 a8 queen\", \"castle short\".\n")
-			except InvalidPositionError as e:
-				print("Invalid position: " + e.position + ". Files range from A to H, ranks range from 1 to 8.\n")
-			except NoPieceError as e:
-				print("Invalid move. No " + e.color + " piece at square " + e.position + ".\n")
-			except EmptySquareError as e:
-				print("There are no pieces at " + e.position + ".\n")
-			except SameSquareError as e:
-				print("Invalid move. Cannot move a piece to the same square it is on.\n")
-			except InvalidMoveError as e:
-				print("Invalid move. Cannot move " + e.piece_type + " from " + e.start_position + " to " + e.end_position + ".\n")
-			except InvalidPieceCheckError as e:
-				print("Invalid move. Cannot move " + e.piece_type + " when in check.\n")
-			except InvalidCastleInputError as e:
-				print("Invalid input. Castling requires a direction, short (kingside) or long (queenside). Ex: \"castle short\".\n")
-			except InvalidCastleError as e:
-				print("Invalid move. Cannot castle.\n")
-			except DeclinedDrawError as e:
-				print(e.color + " declined the draw.\n")
+			except INPUT_ERRORS as e:
+				self.write(describe_input_error(e))
 		return end_of_turn
 
+	def engine_move(self,turn_color):
+		if self.book is not None:
+			book_move = self.book.choose_move(self.board)
+			if book_move is not None:
+				self.board.apply_move(book_move)
+				self.engine_report = turn_color + " played " + str(book_move) + " (book)."
+				return True
+
+		result = self.engine.search(self.engine_depth,self.engine_movetime)
+		if result.move is not None:
+			self.board.apply_move(result.move)
+			self.engine_report = turn_color + " played " + str(result.move) + " (" + str(result) + ")."
+		else:
+			self.resign_status = True
+		return True
+
 	def attempt_move(self,turn_color):
-		inp = input(turn_color + " to play: ")
+		inp = self.prompt(turn_color + " to play: ")
+		return self.process_input(inp,turn_color)
+
+	def process_input(self,inp,turn_color):
 		inp_array = inp.lower().split()
 		position_regex = "[a-hA-H][1-8]"
 
@@ -106,10 +154,13 @@ class Game:
 				except:
 					raise
 				return True
+			elif inp_array[0] == "?book" and len(inp_array) == 1:
+				self.book_report = self.describe_book_moves()
+				return False
 			elif inp_array[0][0] == "?" and len(inp_array[0]) == 3 and len(inp_array) == 1:
 				position_inp = inp_array[0][1] + inp_array[0][2]
 				if re.match(position_regex,position_inp):
-					position = Position(int(position_inp[1])-1,int(ord(position_inp[0]))-97)
+					position = convert_input_to_position(position_inp)
 					try:
 						self.board.highlight_possible_moves(position)
 						return False
@@ -124,8 +175,8 @@ class Game:
 
 				if re.match(position_regex,start_inp):
 					if re.match(position_regex,end_inp):
-						start = Position(int(start_inp[1])-1,int(ord(start_inp[0]))-97)
-						end = Position(int(end_inp[1])-1,int(ord(end_inp[0])-96)-1)
+						start = convert_input_to_position(start_inp)
+						end = convert_input_to_position(end_inp)
 						try:
 							self.board.make_move(start,end,turn_color,promotion_type)
 							return True
@@ -138,214 +189,82 @@ class Game:
 			else:
 				raise InvalidInputError(inp)
 
+	def describe_book_moves(self):
+		if self.book is None:
+			return "No opening book loaded."
+		book_moves = self.book.find_moves(self.board)
+		if not book_moves:
+			return "No book moves for this position."
+		return "Book moves: " + format_book_moves(book_moves) + "."
+
+	def write(self,text):
+		print(text)
+		self.renderer.record_output(text)
+
+	def prompt(self,text):
+		inp = input(text)
+		self.renderer.record_output(text + inp)
+		return inp
+
+	def message(self,text):
+		self.write(text + "\n")
+
 	def warn_check(self,color):
-		print(color + " is in check.\n")
+		self.message(color + " is in check.")
 
 	def checkmate(self,color):
-		print("Checkmate, " + color + " wins.\n")
+		self.message("Checkmate, " + color + " wins.")
+
+	def tablebase_win(self,color):
+		self.message("Tablebase win, " + color + " wins.")
 
 	def resignation(self,color):
-		print("Resignation, " + color + " wins.\n")
+		self.message("Resignation, " + color + " wins.")
 
 	def draw(self):
-		print("Draw.\n")
+		self.message("Draw.")
 
 	def attempt_draw(self,turn_color):
 		opponent_color = get_opponent_color(turn_color)
+		if opponent_color == self.engine_color:
+			if evaluate(self.board) > 0:
+				self.draw_status = True
+				return
+			raise DeclinedDrawError(opponent_color)
 		while True:
-			draw_response = input(turn_color + " offers a draw. Does " + opponent_color + " accept? (y/n): ").lower()
+			draw_response = self.prompt(turn_color + " offers a draw. Does " + opponent_color + " accept? (y/n): ").lower()
 			if draw_response == "n":
 				raise DeclinedDrawError(opponent_color)
 			elif draw_response == "y":
 				self.draw_status = True
 				break
 			else:
-				print("Please enter one of y or n.")
+				self.write("Please enter one of y or n.")
 
 	def display_board(self):
-		if self.piece_display_type == "pieces":
-			self.display_board_pieces()
-		elif self.piece_display_type == "letters":
-			self.display_board_letters()
-
-	def display_board_letters(self):
-		self.clear()
-
-		print()
-
-		string_to_print = "  "
-		for i in range(41):
-			string_to_print += "_"
-		print(string_to_print)
-
-		for rank in range(8):
-			real_rank = 7-rank
-
-			file = 0
-			string_to_print = "  "
-			for i in range(41):
-				if i % 5 == 0:
-					string_to_print += "|"
-				elif i % 5 == 2:
-					highlighted = self.board.board[real_rank,file].is_highlighted
-					if highlighted:
-						string_to_print += "o"
-					else:
-						string_to_print += " "
-					file += 1
-				else:
-					string_to_print += " "
-			print(string_to_print)
-
-			file = 0
-			string_to_print = str(real_rank+1) + " "
-			for i in range(41):
-				if i % 5 == 0:
-					string_to_print += "|"
-				elif i % 5 == 2:
-					string_to_print += self.format_piece_letters(real_rank,file)
-					file += 1
-				elif i % 5 == 1 or i % 5 == 3:
-					string_to_print += " "
-			print(string_to_print)
-
-			string_to_print = "  "
-			for i in range(41):
-				if i % 5 == 0:
-					string_to_print += "|"
-				else:
-					string_to_print += "_"
-			print(string_to_print)
-
-		string_to_print = "  "
-		file = 0
-		for i in range(41):
-			if i % 5 == 2:
-				string_to_print += chr(file + 97)
-				file += 1
-			else:
-				string_to_print += " "
-		print(string_to_print)
-
-		print()
-
-	def display_board_pieces(self):
-		self.clear()
-
-		print()
-
-		string_to_print = "  "
-		for i in range(33):
-			string_to_print += "_"
-		print(string_to_print)
-
-		for rank in range(8):
-			real_rank = 7-rank
-
-			file = 0
-			string_to_print = "  "
-			for i in range(33):
-				if i % 4 == 0:
-					string_to_print += "|"
-				elif i % 4 == 2:
-					highlighted = self.board.board[real_rank,file].is_highlighted
-					if highlighted:
-						string_to_print += "o"
-					else:
-						string_to_print += " "
-					file += 1
-				else:
-					string_to_print += " "
-			print(string_to_print)
-
-			file = 0
-			string_to_print = str(real_rank+1) + " "
-			for i in range(33):
-				if i % 4 == 0:
-					string_to_print += "|"
-				elif i % 4 == 2:
-					string_to_print += self.format_piece_pieces(real_rank,file)
-					file += 1
-				else:
-					string_to_print += " "
-			print(string_to_print)
-
-			string_to_print = "  "
-			for i in range(33):
-				if i % 4 == 0:
-					string_to_print += "|"
-				else:
-					string_to_print += "_"
-			print(string_to_print)
-
-		string_to_print = "  "
-		file = 0
-		for i in range(33):
-			if i % 4 == 2:
-				string_to_print += chr(file + 97)
-				file += 1
-			else:
-				string_to_print += " "
-		print(string_to_print)
-
-		print()
-
-	def format_piece_letters(self,rank,file):
-		piece_type = self.board.board[rank,file].piece.type
-		piece_color = self.board.board[rank,file].piece.color
-		formatted_color = piece_color[0]
-
-		if piece_type == "nopiece":
-			return "  "
-		elif piece_type == "pawn":
-			return formatted_color + "p"
-		elif piece_type == "rook":
-			return formatted_color + "R"
-		elif piece_type == "knight":
-			return formatted_color + "N"
-		elif piece_type == "bishop": 
-			return formatted_color + "B"
-		elif piece_type == "queen": 
-			return formatted_color + "Q"
-		elif piece_type == "king":
-			return formatted_color + "K"
-
-	def format_piece_pieces(self,rank,file):
-		piece_type = self.board.board[rank,file].piece.type
-		piece_color = self.board.board[rank,file].piece.color
-		formatted_color = piece_color[0]
-
-		if piece_type == "nopiece":
-			return " "
-		elif piece_color == "black":
-			if piece_type == "pawn":
-				return "\u2659"
-			elif piece_type == "rook":
-				return "\u2656"
-			elif piece_type == "knight":
-				return "\u2658"
-			elif piece_type == "bishop": 
-				return "\u2657"
-			elif piece_type == "queen": 
-				return "\u2655"
-			elif piece_type == "king":
-				return "\u2654"
-		elif piece_color == "white":
-			if piece_type == "pawn":
-				return "\u265f"
-			elif piece_type == "rook":
-				return "\u265c"
-			elif piece_type == "knight":
-				return "\u265e"
-			elif piece_type == "bishop": 
-				return "\u265d"
-			elif piece_type == "queen": 
-				return "\u265b"
-			elif piece_type == "king":
-				return "\u265a"
+		self.renderer.render(self.board)
 
 	def reset(self):
 		self.board.reset()
 
-	def clear(self):
-		system('clear')
\ No newline at end of file
+def describe_input_error(e):
+	if isinstance(e,InvalidInputError):
+		return "Invalid input. Correct format \"startsquare endsquare\", \"startsquare endsquare promotiontype\", \"castle direction\", \"resign\", \"?square\", \"?book\", or \"draw?\". Exs: \"a2 a4\", \"a7 a8 queen\", \"castle short\".\n"
+	elif isinstance(e,InvalidPositionError):
+		return "Invalid position: " + e.position + ". Files range from A to H, ranks range from 1 to 8.\n"
+	elif isinstance(e,NoPieceError):
+		return "Invalid move. No " + e.color + " piece at square " + e.position + ".\n"
+	elif isinstance(e,EmptySquareError):
+		return "There are no pieces at " + e.position + ".\n"
+	elif isinstance(e,SameSquareError):
+		return "Invalid move. Cannot move a piece to the same square it is on.\n"
+	elif isinstance(e,InvalidMoveError):
+		return "Invalid move. Cannot move " + e.piece_type + " from " + e.start_position + " to " + e.end_position + ".\n"
+	elif isinstance(e,InvalidPromotionTypeError):
+		return "Invalid move. Pawn moving from " + e.start_position + " to " + e.end_position + " requires a promotion type: queen, rook, knight, or bishop.\n"
+	elif isinstance(e,InvalidCastleInputError):
+		return "Invalid input. Castling requires a direction, short (kingside) or long (queenside). Ex: \"castle short\".\n"
+	elif isinstance(e,InvalidCastleError):
+		return "Invalid move. Cannot castle.\n"
+	elif isinstance(e,DeclinedDrawError):
+		return e.color + " declined the draw.\n"
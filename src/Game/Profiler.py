@@ -0,0 +1,70 @@
+from time import perf_counter
+from os import environ
+import json
+
+PROFILE_ENABLED = environ.get("CLICHESS_PROFILE","") == "1"
+PROFILE_JSON_PATH = environ.get("CLICHESS_PROFILE_JSON") or None
+
+BOARD_PROFILED_METHODS = ("evaluate_attacked_squares","update_attacked_squares","is_valid_move","make_move","castle","highlight_possible_moves")
+GAME_PROFILED_METHODS = ("display_board","process_input")
+ENGINE_PROFILED_METHODS = ("search",)
+
+class Profiler:
+	def __init__(self,json_path=None):
+		self.json_path = json_path
+		self.counts = {}
+		self.times = {}
+		self.games = 0
+
+	def instrument(self,target,method_names,prefix):
+		for method_name in method_names:
+			setattr(target,method_name,self.wrap(prefix + "." + method_name,getattr(target,method_name)))
+
+	def wrap(self,name,method):
+		self.counts.setdefault(name,0)
+		self.times.setdefault(name,0.0)
+		def timed_method(*args,**kwargs):
+			start_time = perf_counter()
+			try:
+				return method(*args,**kwargs)
+			finally:
+				self.times[name] += perf_counter() - start_time
+				self.counts[name] += 1
+		return timed_method
+
+	def finish_game(self):
+		self.games += 1
+		print(self.summary())
+		if self.json_path is not None:
+			with open(self.json_path,"w") as profile_file:
+				json.dump(self.to_dict(),profile_file,indent=2)
+			print("Profile written to " + self.json_path + ".\n")
+
+	def sorted_names(self):
+		return sorted(self.counts,key=lambda name: self.times[name],reverse=True)
+
+	def to_dict(self):
+		return {
+			"games": self.games,
+			"timers": {name: {"calls": self.counts[name],"seconds": self.times[name]} for name in self.sorted_names()}
+		}
+
+	def summary(self):
+		lines = ["Profile after " + str(self.games) + " game(s), cumulative time including nested calls:"]
+		for name in self.sorted_names():
+			lines.append(format_timer(name,self.counts[name],self.times[name]))
+		return "\n".join(lines) + "\n"
+
+def format_timer(name,calls,seconds):
+	return name.ljust(32) + str(calls).rjust(9) + " calls " + format(1000*seconds,".3f").rjust(11) + "ms " + format_microseconds_per_call(calls,seconds).rjust(11) + "us/call"
+
+def format_microseconds_per_call(calls,seconds):
+	if calls > 0:
+		return format(1000000*seconds/calls,".1f")
+	else:
+		return "-"
+
+def profiler_from_environment():
+	if PROFILE_ENABLED or PROFILE_JSON_PATH is not None:
+		return Profiler(PROFILE_JSON_PATH)
+	return None
@@ -0,0 +1,102 @@
+from .Board.Bitboard import COLORS, PIECE_TYPES, iterate_squares
+from .Board.Piece import EMPTY_PIECE_CODE, get_piece_code, build_piece_symbols
+from shutil import get_terminal_size
+from sys import stdout
+
+PIECE_LETTER_SYMBOLS = build_piece_symbols(("wp","wN","wB","wR","wQ","wK"),("bp","bN","bB","bR","bQ","bK"),"  ")
+PIECE_UNICODE_SYMBOLS = build_piece_symbols(("\u265f","\u265e","\u265d","\u265c","\u265b","\u265a"),("\u2659","\u2658","\u2657","\u2656","\u2655","\u2654")," ")
+CELL_WIDTHS = {
+	"letters": 5,
+	"pieces": 4
+}
+PIECE_SYMBOLS = {
+	"letters": PIECE_LETTER_SYMBOLS,
+	"pieces": PIECE_UNICODE_SYMBOLS
+}
+CLEAR_SCREEN = "\x1b[H\x1b[2J\x1b[3J"
+CLEAR_BELOW = "\x1b[J"
+FRAME_HEIGHT = 28
+RESERVED_LINES = 6
+
+class BoardRenderer:
+	def __init__(self,piece_display_type,output=stdout):
+		self.cell_width = CELL_WIDTHS[piece_display_type]
+		self.symbols = PIECE_SYMBOLS[piece_display_type]
+		self.output = output
+		self.incremental = output.isatty()
+		self.drawn_cells = None
+		self.terminal_size = None
+		self.lines_below = 0
+		self.highlight_rows = [None]*8
+		self.piece_rows = [None]*8
+		self.top_border = "  " + "_"*(self.cell_width*8 + 1)
+		self.bottom_border = "  " + ("|" + "_"*(self.cell_width-1))*8 + "|"
+		self.file_labels = "  " + "".join("  " + chr(file + 97) + " "*(self.cell_width-3) for file in range(8)) + " "
+
+	def render(self,board):
+		cells = self.read_cells(board)
+		if self.incremental and self.drawn_cells is not None and self.terminal_size == get_terminal_size() and self.lines_below < self.terminal_size.lines - FRAME_HEIGHT:
+			frame = self.build_update(cells)
+		else:
+			frame = self.build_frame(cells)
+		self.drawn_cells = cells
+		self.lines_below = 0
+		self.output.write(frame)
+		self.output.flush()
+
+	def record_output(self,text):
+		columns = max((self.terminal_size or get_terminal_size()).columns,1)
+		for line in text.split("\n"):
+			self.lines_below += max(1,-(-len(line)//columns))
+
+	def read_cells(self,board):
+		cells = [EMPTY_PIECE_CODE << 1]*64
+		for color in COLORS:
+			for piece_type in PIECE_TYPES:
+				code = get_piece_code(color,piece_type) << 1
+				for square in iterate_squares(board.bitboards[color][piece_type]):
+					cells[square] = code
+		for square in iterate_squares(board.highlighted):
+			cells[square] |= 1
+		return cells
+
+	def build_frame(self,cells):
+		self.terminal_size = get_terminal_size()
+		if self.terminal_size.lines < FRAME_HEIGHT + RESERVED_LINES:
+			self.incremental = False
+
+		lines = ["",self.top_border]
+		for rank in range(7,-1,-1):
+			if self.drawn_cells is None or cells[rank*8:rank*8+8] != self.drawn_cells[rank*8:rank*8+8]:
+				self.build_rows(rank,cells)
+			lines.append(self.highlight_rows[rank])
+			lines.append(self.piece_rows[rank])
+			lines.append(self.bottom_border)
+		lines.append(self.file_labels)
+		lines.append("")
+		return CLEAR_SCREEN + "\n".join(lines) + "\n"
+
+	def build_rows(self,rank,cells):
+		highlight_row = "  "
+		piece_row = str(rank+1) + " "
+		for square in range(rank*8,rank*8+8):
+			highlight_row += "| " + ("o" if cells[square] & 1 else " ") + " "*(self.cell_width-3)
+			piece_row += "| " + self.symbols[cells[square] >> 1] + " "
+		self.highlight_rows[rank] = highlight_row + "|"
+		self.piece_rows[rank] = piece_row + "|"
+
+	def build_update(self,cells):
+		updates = []
+		for square in range(64):
+			if cells[square] != self.drawn_cells[square]:
+				rank = square >> 3
+				column = str((square & 7)*self.cell_width + 5)
+				screen_line = 3 + 3*(7-rank)
+				updates.append("\x1b[" + str(screen_line) + ";" + column + "H" + ("o" if cells[square] & 1 else " "))
+				updates.append("\x1b[" + str(screen_line+1) + ";" + column + "H" + self.symbols[cells[square] >> 1])
+				self.highlight_rows[rank] = None
+		for rank in range(8):
+			if self.highlight_rows[rank] is None:
+				self.build_rows(rank,cells)
+		updates.append("\x1b[" + str(FRAME_HEIGHT+1) + ";1H" + CLEAR_BELOW)
+		return "".join(updates)
@@ -1,3 +1,5 @@
+from .Board.Position import Position
+
 def get_opponent_color(color):
 	if color == "white":
 		return "black"
@@ -26,4 +28,7 @@ def get_color_prefix(color):
 	if color == "white":
 		return "w"
 	else:
-		return "b"
\ No newline at end of file
+		return "b"
+
+def convert_input_to_position(position_inp):
+	return Position(int(position_inp[1])-1,ord(position_inp[0].lower())-97)
\ No newline at end of file
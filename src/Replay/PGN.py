@@ -0,0 +1,146 @@
+import re
+import mmap
+import os
+
+HEADER_REGEX = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+MOVE_NUMBER_REGEX = re.compile(r"^\d+\.+")
+RESULT_TOKENS = ("1-0","0-1","1/2-1/2","*")
+
+class PGNGame:
+	def __init__(self,headers,movetext_lines):
+		self.headers = headers
+		self.movetext_lines = movetext_lines
+		self.parsed_movetext = None
+
+	@property
+	def moves(self):
+		return self.parse()[0]
+
+	@property
+	def result(self):
+		return self.parse()[1]
+
+	def parse(self):
+		if self.parsed_movetext is None:
+			movetext = b"\n".join(self.movetext_lines).decode("utf-8","replace")
+			self.parsed_movetext = parse_movetext(movetext)
+			self.movetext_lines = None
+		return self.parsed_movetext
+
+	def name(self):
+		return self.headers.get("White","?") + " - " + self.headers.get("Black","?")
+
+def iterate_pgn_games(path,header_filter=None):
+	with open(path,"rb") as pgn_file:
+		if os.fstat(pgn_file.fileno()).st_size == 0:
+			return
+		buffer = mmap.mmap(pgn_file.fileno(),0,access=mmap.ACCESS_READ)
+		try:
+			yield from iterate_pgn_lines(iter(buffer.readline,b""),header_filter)
+		finally:
+			buffer.close()
+
+def parse_pgn_text(text,header_filter=None):
+	return iterate_pgn_lines(text.encode("utf-8").splitlines(),header_filter)
+
+def iterate_pgn_lines(lines,header_filter=None):
+	headers = {}
+	movetext_lines = []
+	in_movetext = False
+	in_comment = False
+	skip_game = False
+	for raw_line in lines:
+		line = raw_line.strip()
+		header_match = None
+		if line.startswith(b"[") and not in_comment:
+			header_match = HEADER_REGEX.match(line.decode("utf-8","replace"))
+		if header_match is not None:
+			if in_movetext:
+				if not skip_game:
+					yield PGNGame(headers,movetext_lines)
+				headers = {}
+				movetext_lines = []
+				in_movetext = False
+			headers[header_match.group(1)] = header_match.group(2)
+		elif line and (in_comment or not line.startswith(b"%")):
+			if not in_movetext:
+				in_movetext = True
+				skip_game = not matches_header_filter(header_filter,headers)
+			if not skip_game:
+				movetext_lines.append(line)
+			in_comment = ends_inside_comment(line,in_comment)
+	if (headers or in_movetext) and not skip_game and matches_header_filter(header_filter,headers):
+		yield PGNGame(headers,movetext_lines)
+
+def ends_inside_comment(line,in_comment):
+	index = 0
+	while True:
+		if in_comment:
+			closing_index = line.find(b"}",index)
+			if closing_index == -1:
+				return True
+			in_comment = False
+			index = closing_index + 1
+		else:
+			opening_index = line.find(b"{",index)
+			if opening_index == -1:
+				return False
+			semicolon_index = line.find(b";",index)
+			if semicolon_index != -1 and semicolon_index < opening_index:
+				return False
+			in_comment = True
+			index = opening_index + 1
+
+def matches_header_filter(header_filter,headers):
+	if header_filter is None:
+		return True
+	elif callable(header_filter):
+		return header_filter(headers)
+	else:
+		for key, value in header_filter.items():
+			if headers.get(key) != value:
+				return False
+		return True
+
+def parse_movetext(movetext):
+	moves = []
+	result = "*"
+	for token in tokenize_movetext(movetext):
+		if token in RESULT_TOKENS:
+			result = token
+		else:
+			moves.append(token)
+	return moves, result
+
+def tokenize_movetext(movetext):
+	tokens = []
+	variation_depth = 0
+	index = 0
+	length = len(movetext)
+	while index < length:
+		character = movetext[index]
+		if character == "{":
+			closing_index = movetext.find("}",index)
+			index = length if closing_index == -1 else closing_index + 1
+		elif character == ";":
+			closing_index = movetext.find("\n",index)
+			index = length if closing_index == -1 else closing_index + 1
+		elif character == "(":
+			variation_depth += 1
+			index += 1
+		elif character == ")":
+			variation_depth -= 1
+			index += 1
+		elif character.isspace():
+			index += 1
+		else:
+			token_end = index
+			while token_end < length and not movetext[token_end].isspace() and movetext[token_end] not in "{;()":
+				token_end += 1
+			token = movetext[index:token_end]
+			index = token_end
+			if variation_depth == 0 and not token.startswith("$"):
+				token = MOVE_NUMBER_REGEX.sub("",token)
+				if token:
+					tokens.append(token)
+	return tokens
@@ -0,0 +1,137 @@
+from ..Game.Board.Board import Board, FEN_PIECE_TYPES
+from ..Game.Board.BoardErrors import InvalidFENError, InvalidPositionRecordError
+from ..Game.Board.PositionRecord import encode_position, decode_position, encode_positions, decode_positions
+from .Replay import iterate_replay_tasks, replay_task
+import os
+
+REGRESSION_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),"test","regression")
+
+FEN_CASES = [
+	{
+		"name": "start",
+		"fen": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+		"valid": True
+	},
+	{
+		"name": "en_passant",
+		"fen": "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+		"valid": True
+	},
+	{
+		"name": "counters",
+		"fen": "4k3/8/8/8/8/8/P7/4K3 w - - 99 80",
+		"valid": True
+	},
+	{
+		"name": "white_pawn_on_rank_8",
+		"fen": "P3k3/8/8/8/8/8/8/4K3 w - - 0 1",
+		"valid": False
+	},
+	{
+		"name": "black_pawn_on_rank_1",
+		"fen": "4k3/8/8/8/8/8/8/p3K3 b - - 0 1",
+		"valid": False
+	},
+	{
+		"name": "side_not_to_move_in_check",
+		"fen": "4k3/4R3/8/8/8/8/8/4K3 w - - 0 1",
+		"valid": False
+	},
+	{
+		"name": "missing_king",
+		"fen": "8/8/8/8/8/8/8/4K3 w - - 0 1",
+		"valid": False
+	}
+]
+
+PGN_CASES = [
+	{
+		"name": "comment_wrapped_header",
+		"file": "comment_wrapped_header.pgn",
+		"games": [(7,"1-0",False),(3,"*",False)]
+	},
+	{
+		"name": "bad_fen_headers",
+		"file": "bad_fen_headers.pgn",
+		"games": [(0,"*",True),(0,"*",True),(0,"*",True),(1,"1-0",False)]
+	},
+	{
+		"name": "san",
+		"file": "san.pgn",
+		"games": [(15,"*",False),(9,"*",False),(0,"*",True),(4,"*",True)]
+	}
+]
+
+def run_regression_suite():
+	results = run_fen_checks() + run_pgn_checks()
+	all_passed = True
+	for name, passed, detail in results:
+		all_passed = all_passed and passed
+		print(format_regression_result(name,passed,detail))
+	print(str(sum(1 for name, passed, detail in results if passed)) + "/" + str(len(results)) + " regression checks passed")
+	return all_passed
+
+def run_fen_checks():
+	results = []
+	for case in FEN_CASES:
+		if case["valid"]:
+			results.append(check_fen_round_trip(case["name"],case["fen"]))
+			results.append(check_record_round_trip(case["name"],case["fen"]))
+		else:
+			results.append(check_invalid_fen(case["name"],case["fen"]))
+			results.append(check_invalid_record(case["name"],case["fen"]))
+	return results
+
+def check_fen_round_trip(name,fen):
+	written_fen = Board.from_fen(fen).to_fen()
+	return ("fen " + name,written_fen == fen,"wrote " + written_fen)
+
+def check_record_round_trip(name,fen):
+	board = Board.from_fen(fen)
+	decoded_fen = decode_position(encode_position(board)).to_fen()
+	batch_fens = [decoded_board.to_fen() for decoded_board in decode_positions(encode_positions([board,board]))]
+	return ("record " + name,decoded_fen == fen and batch_fens == [fen,fen],"decoded " + decoded_fen)
+
+def check_invalid_fen(name,fen):
+	try:
+		Board.from_fen(fen)
+	except InvalidFENError:
+		return ("fen " + name,True,"")
+	return ("fen " + name,False,"accepted invalid FEN")
+
+def check_invalid_record(name,fen):
+	try:
+		decode_position(encode_unchecked_position(fen))
+	except InvalidPositionRecordError:
+		return ("record " + name,True,"")
+	return ("record " + name,False,"accepted invalid record")
+
+def encode_unchecked_position(fen):
+	board = Board()
+	fields = fen.split()
+	board.clear_pieces()
+	rank = 7
+	file = 0
+	for character in fields[0]:
+		if character == "/":
+			rank -= 1
+			file = 0
+		elif character.isdigit():
+			file += int(character)
+		else:
+			board.place_piece(rank*8 + file,FEN_PIECE_TYPES[character.lower()],"white" if character.isupper() else "black")
+			file += 1
+	board.turn_color = "white" if fields[1] == "w" else "black"
+	return encode_position(board)
+
+def run_pgn_checks():
+	results = []
+	for case in PGN_CASES:
+		replayed = [replay_task(task) for task in iterate_replay_tasks([os.path.join(REGRESSION_DIRECTORY,case["file"])])]
+		games = [(result.moves_played,result.outcome,result.error is not None) for result in replayed]
+		results.append(("pgn " + case["name"],games == case["games"],"replayed " + str(games)))
+	return results
+
+def format_regression_result(name,passed,detail):
+	status = "ok" if passed else "FAIL (" + detail + ")"
+	return name.ljust(40) + " " + status
@@ -0,0 +1,154 @@
+from ..Game.Board.Board import Board
+from ..Game.Board.Notation import parse_san
+from ..Game.Board.Bitboard import square_to_position
+from ..Game.Board.BoardErrors import InvalidPositionError, NoPieceError, SameSquareError, InvalidMoveError, InvalidPromotionTypeError, InvalidCastleError, InvalidNotationError, InvalidFENError
+from ..Game.InputErrors import InvalidInputError
+from ..Game.Utils import get_opponent_color, convert_input_to_position
+from .PGN import iterate_pgn_games
+from multiprocessing import Pool
+from time import perf_counter
+import re
+
+POSITION_REGEX = re.compile("^[a-h][1-8]$")
+ANALYSIS_CHUNK_SIZE = 8
+OUTCOMES = ("1-0","0-1","1/2-1/2","*")
+REPLAY_ERRORS = (InvalidPositionError,NoPieceError,SameSquareError,InvalidMoveError,InvalidPromotionTypeError,InvalidCastleError,InvalidNotationError,InvalidInputError)
+
+class ReplayResult:
+	def __init__(self,name,moves_played,outcome,expected_result,error,final_hash):
+		self.name = name
+		self.moves_played = moves_played
+		self.outcome = outcome
+		self.expected_result = expected_result
+		self.error = error
+		self.final_hash = final_hash
+
+	def __str__(self):
+		description = self.name + ": " + str(self.moves_played) + " plies, " + self.outcome
+		if self.expected_result is not None:
+			description += " (recorded " + self.expected_result + ")"
+		description += ", final position " + format(self.final_hash,"016x")
+		if self.error is not None:
+			description += ", error at " + self.error
+		return description
+
+def replay_files(paths,header_filter=None):
+	return report_replay_results(map(replay_task,iterate_replay_tasks(paths,header_filter)))
+
+def analyze_files(paths,workers,header_filter=None):
+	with Pool(workers) as pool:
+		return report_replay_results(pool.imap(replay_task,iterate_replay_tasks(paths,header_filter),ANALYSIS_CHUNK_SIZE),workers)
+
+def iterate_replay_tasks(paths,header_filter=None):
+	for path in paths:
+		if path.lower().endswith(".pgn"):
+			for game_index, game in enumerate(iterate_pgn_games(path,header_filter)):
+				yield (path + " #" + str(game_index+1) + " " + game.name(),game)
+		else:
+			yield (path,None)
+
+def replay_task(task):
+	name, game = task
+	if game is None:
+		return replay_coordinate_file(name)
+	else:
+		return replay_pgn_game(game,name)
+
+def report_replay_results(results,workers=1):
+	start_time = perf_counter()
+	games = 0
+	total_moves = 0
+	errors = 0
+	outcome_counts = dict.fromkeys(OUTCOMES,0)
+	for result in results:
+		print(result)
+		games += 1
+		total_moves += result.moves_played
+		outcome_counts[result.outcome] += 1
+		if result.error is not None:
+			errors += 1
+	elapsed = perf_counter() - start_time
+	print(format_outcome_counts(outcome_counts))
+	print(format_replay_summary(games,total_moves,errors,elapsed,workers))
+	return errors == 0
+
+def replay_pgn_game(game,name):
+	if "FEN" in game.headers:
+		try:
+			board = Board.from_fen(game.headers["FEN"])
+		except InvalidFENError as e:
+			return ReplayResult(name,0,"*",game.result,"FEN header " + game.headers["FEN"] + " (" + type(e).__name__ + ")",0)
+	else:
+		board = Board()
+
+	moves_played = 0
+	error = None
+	for san in game.moves:
+		try:
+			play_move(board,parse_san(board,san))
+		except REPLAY_ERRORS as e:
+			error = describe_error(moves_played,san,e)
+			break
+		moves_played += 1
+	return ReplayResult(name,moves_played,determine_outcome(board),game.result,error,board.hash)
+
+def replay_coordinate_file(path):
+	board = Board()
+	moves_played = 0
+	error = None
+	try:
+		with open(path) as move_file:
+			for line in move_file:
+				inp = line.strip()
+				if not inp:
+					continue
+				try:
+					play_coordinate_move(board,inp)
+				except REPLAY_ERRORS as e:
+					error = describe_error(moves_played,inp,e)
+					break
+				moves_played += 1
+	except (OSError,UnicodeDecodeError) as e:
+		error = "file (" + type(e).__name__ + ")"
+	return ReplayResult(path,moves_played,determine_outcome(board),None,error,board.hash)
+
+def play_move(board,move):
+	turn_color = board.turn_color
+	if board.piece_type_at(move.start,turn_color) == "king" and abs(move.end-move.start) == 2:
+		board.castle(turn_color,"short" if move.end > move.start else "long")
+	else:
+		board.make_move(square_to_position(move.start),square_to_position(move.end),turn_color,move.promotion_type)
+
+def play_coordinate_move(board,inp):
+	inp_array = inp.lower().split()
+	turn_color = board.turn_color
+	if inp_array[0] == "castle" and len(inp_array) == 2:
+		board.castle(turn_color,inp_array[1])
+	elif (len(inp_array) == 2 or len(inp_array) == 3) and POSITION_REGEX.match(inp_array[0]) and POSITION_REGEX.match(inp_array[1]):
+		promotion_type = inp_array[2] if len(inp_array) == 3 else None
+		board.make_move(convert_input_to_position(inp_array[0]),convert_input_to_position(inp_array[1]),turn_color,promotion_type)
+	else:
+		raise InvalidInputError(inp)
+
+def determine_outcome(board):
+	turn_color = board.turn_color
+	last_mover = get_opponent_color(turn_color)
+	if board.is_checkmate(last_mover):
+		return "1-0" if last_mover == "white" else "0-1"
+	elif board.is_draw(turn_color):
+		return "1/2-1/2"
+	else:
+		return "*"
+
+def describe_error(moves_played,inp,error):
+	move_number = moves_played//2 + 1
+	return "move " + str(move_number) + (". " if moves_played % 2 == 0 else "... ") + inp + " (" + type(error).__name__ + ")"
+
+def format_outcome_counts(outcome_counts):
+	return "Outcomes: " + ", ".join(outcome + " " + str(outcome_counts[outcome]) for outcome in OUTCOMES)
+
+def format_replay_summary(games,total_moves,errors,elapsed,workers=1):
+	games_per_second = games/elapsed if elapsed > 0 else 0
+	moves_per_second = total_moves/elapsed if elapsed > 0 else 0
+	worker_description = " with " + str(workers) + " workers" if workers > 1 else ""
+	return "Replayed " + str(games) + " games (" + str(total_moves) + " plies)" + worker_description + " in " + format(elapsed,".3f") + "s: " + format(games_per_second,".1f") + " games/s, " + format(moves_per_second,".0f") + " plies/s, " + str(errors) + " errors"
@@ -0,0 +1,109 @@
+from ..Game.Game import Game, INPUT_ERRORS, describe_input_error
+from ..Game.Board.Bitboard import iterate_squares, square_name
+from ..Game.Utils import get_opponent_color
+import asyncio
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5050
+
+class GameSession(Game):
+	def __init__(self,send):
+		super().__init__("letters")
+		self.send = send
+		self.draw_offer = None
+		self.reset_status()
+
+	def start_turn(self):
+		turn_color = self.board.turn_color
+		self.display_board()
+		self.board.unhighlight_squares()
+		if self.book_report is not None:
+			self.send(self.book_report)
+			self.book_report = None
+		if self.draw_status or self.board.is_draw(turn_color):
+			self.game_end = True
+			self.draw()
+		else:
+			if self.check_status:
+				self.warn_check(turn_color)
+			self.send(turn_color + " to play:")
+
+	def handle_input(self,inp):
+		turn_color = self.board.turn_color
+		if self.draw_offer is not None:
+			self.answer_draw(inp.strip().lower())
+			return
+
+		try:
+			turn_complete = self.process_input(inp,turn_color)
+		except INPUT_ERRORS as e:
+			self.send(describe_input_error(e).rstrip("\n"))
+			self.send(turn_color + " to play:")
+			return
+
+		if self.draw_offer is not None:
+			self.send(turn_color + " offers a draw. Does " + get_opponent_color(turn_color) + " accept? (y/n):")
+			return
+		if turn_complete:
+			self.finish_turn(turn_color)
+			self.check_status = self.board.is_check(turn_color)
+		if not self.game_end:
+			self.start_turn()
+
+	def answer_draw(self,response):
+		if response == "y":
+			self.draw_offer = None
+			self.draw_status = True
+			self.start_turn()
+		elif response == "n":
+			self.send(get_opponent_color(self.draw_offer) + " declined the draw.")
+			self.draw_offer = None
+			self.send(self.board.turn_color + " to play:")
+		else:
+			self.send("Please enter one of y or n.")
+
+	def attempt_draw(self,turn_color):
+		self.draw_offer = turn_color
+
+	def display_board(self):
+		self.send("board " + self.board.to_fen())
+		if self.board.highlighted:
+			self.send("highlighted " + " ".join(square_name(square) for square in iterate_squares(self.board.highlighted)))
+
+	def message(self,text):
+		self.send(text)
+
+async def handle_connection(reader,writer):
+	def send(line):
+		writer.write((line + "\n").encode("utf-8"))
+
+	session = GameSession(send)
+	session.start_turn()
+	try:
+		await writer.drain()
+		while not session.game_end:
+			line = await reader.readline()
+			if not line:
+				break
+			session.handle_input(line.decode("utf-8","replace"))
+			await writer.drain()
+	except ConnectionError:
+		pass
+	finally:
+		writer.close()
+
+async def serve(host=DEFAULT_HOST,port=DEFAULT_PORT,socket_path=None):
+	if socket_path is not None:
+		server = await asyncio.start_unix_server(handle_connection,socket_path)
+		print("Serving games on " + socket_path)
+	else:
+		server = await asyncio.start_server(handle_connection,host,port)
+		print("Serving games on " + host + ":" + str(port))
+	async with server:
+		await server.serve_forever()
+
+def run_server(host=DEFAULT_HOST,port=DEFAULT_PORT,socket_path=None):
+	try:
+		asyncio.run(serve(host,port,socket_path))
+	except KeyboardInterrupt:
+		pass
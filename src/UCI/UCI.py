@@ -0,0 +1,245 @@
+from ..Game.Board.Board import Board
+from ..Game.Board.Notation import parse_uci_move
+from ..Game.Board.BoardErrors import InvalidFENError, InvalidNotationError
+from ..Engine.Search import Search, MAX_DEPTH, MATE_SCORE, MATE_BOUND
+from ..Engine.TranspositionTable import TranspositionTable
+from ..Engine.OpeningBook import OpeningBook
+from ..Engine.Tablebase import Tablebase
+from ..Engine.EngineErrors import InvalidBookError
+from threading import Thread, Event, Lock
+import sys
+
+ENGINE_NAME = "CLIChess"
+ENGINE_AUTHOR = "fishac"
+START_POSITION = "startpos"
+DEFAULT_MOVES_TO_GO = 30
+MOVE_OVERHEAD = 50
+MIN_MOVETIME = 10
+
+class UCISession:
+	def __init__(self,input_stream=sys.stdin,output_stream=sys.stdout):
+		self.input_stream = input_stream
+		self.output_stream = output_stream
+		self.output_lock = Lock()
+		self.board = Board()
+		self.position_start = START_POSITION
+		self.position_moves = []
+		self.transposition_table = TranspositionTable()
+		self.stop_event = Event()
+		self.search = Search(self.board,self.transposition_table,self.stop_event)
+		self.search_thread = None
+		self.infinite = False
+		self.ponder_movetime = None
+		self.book = None
+
+	def run(self):
+		for line in self.input_stream:
+			tokens = line.split()
+			if not tokens:
+				continue
+			if not self.handle_command(tokens):
+				break
+		self.stop_search()
+
+	def handle_command(self,tokens):
+		command = tokens[0]
+		if command == "uci":
+			self.send("id name " + ENGINE_NAME)
+			self.send("id author " + ENGINE_AUTHOR)
+			self.send("option name BookFile type string default <empty>")
+			self.send("option name TablebasePath type string default <empty>")
+			self.send("uciok")
+		elif command == "isready":
+			self.send("readyok")
+		elif command == "ucinewgame":
+			self.stop_search()
+			self.transposition_table = TranspositionTable()
+			self.search = Search(self.board,self.transposition_table,self.stop_event)
+			self.set_position(START_POSITION,[])
+		elif command == "position":
+			self.stop_search()
+			self.handle_position(tokens[1:])
+		elif command == "go":
+			self.stop_search()
+			self.handle_go(tokens[1:])
+		elif command == "stop":
+			self.stop_search()
+		elif command == "setoption":
+			self.stop_search()
+			self.handle_setoption(tokens[1:])
+		elif command == "ponderhit":
+			self.handle_ponderhit()
+		elif command == "quit":
+			return False
+		elif command != "debug" and command != "register":
+			self.send("info string unknown command " + command)
+		return True
+
+	def handle_position(self,arguments):
+		if "moves" in arguments:
+			moves_index = arguments.index("moves")
+			moves = arguments[moves_index+1:]
+			arguments = arguments[:moves_index]
+		else:
+			moves = []
+		if arguments == [START_POSITION]:
+			self.set_position(START_POSITION,moves)
+		elif len(arguments) > 1 and arguments[0] == "fen":
+			self.set_position(" ".join(arguments[1:]),moves)
+		else:
+			self.send("info string invalid position command")
+
+	def handle_setoption(self,arguments):
+		if "name" not in arguments or "value" not in arguments:
+			return
+		value_index = arguments.index("value")
+		name = " ".join(arguments[arguments.index("name")+1:value_index])
+		value = " ".join(arguments[value_index+1:])
+		if name.lower() == "bookfile":
+			if self.book is not None:
+				self.book.close()
+				self.book = None
+			if value and value != "<empty>":
+				try:
+					self.book = OpeningBook(value)
+				except (OSError,InvalidBookError):
+					self.send("info string cannot read book " + value)
+		elif name.lower() == "tablebasepath":
+			if self.board.tablebase is not None:
+				self.board.tablebase.close()
+				self.board.tablebase = None
+			if value and value != "<empty>":
+				tablebase = Tablebase(value)
+				if tablebase.max_pieces == 0:
+					self.send("info string no tablebases in " + value)
+				else:
+					self.board.tablebase = tablebase
+		else:
+			self.send("info string unknown option " + name)
+
+	def set_position(self,position_start,moves):
+		if position_start != self.position_start or moves[:len(self.position_moves)] != self.position_moves:
+			try:
+				if position_start == START_POSITION:
+					self.board.reset()
+				else:
+					self.board.load_fen(position_start)
+			except InvalidFENError:
+				self.send("info string invalid fen " + position_start)
+				self.board.reset()
+				position_start = START_POSITION
+				moves = []
+			self.position_start = position_start
+			self.position_moves = []
+
+		for notation in moves[len(self.position_moves):]:
+			try:
+				self.board.push(parse_uci_move(self.board,notation))
+			except InvalidNotationError:
+				self.send("info string invalid move " + notation)
+				break
+			self.position_moves.append(notation)
+
+	def handle_go(self,arguments):
+		limits = parse_go_arguments(arguments)
+		self.infinite = "infinite" in limits or "ponder" in limits
+		self.ponder_movetime = None
+		if self.book is not None and not self.infinite:
+			book_move = self.book.choose_move(self.board)
+			if book_move is not None:
+				self.send("info string book move")
+				self.send("bestmove " + str(book_move))
+				return
+		max_depth = limits.get("depth",MAX_DEPTH)
+		movetime = limits.get("movetime")
+		if movetime is None and not self.infinite:
+			movetime = allocate_movetime(limits,self.board.turn_color)
+		if "ponder" in limits:
+			self.ponder_movetime = movetime if movetime is not None else allocate_movetime(limits,self.board.turn_color)
+			movetime = None
+
+		self.stop_event.clear()
+		self.search_thread = Thread(target=self.run_search,args=(max_depth,movetime),daemon=True)
+		self.search_thread.start()
+
+	def handle_ponderhit(self):
+		if self.ponder_movetime is not None:
+			self.search.set_movetime(self.ponder_movetime)
+			self.ponder_movetime = None
+		self.infinite = False
+
+	def run_search(self,max_depth,movetime):
+		root_stack_size = len(self.board.move_stack)
+		try:
+			move = self.search.search(max_depth,movetime,self.send_info).move
+		except Exception as e:
+			self.send("info string search error " + type(e).__name__ + ": " + str(e))
+			move = self.recover_move(root_stack_size)
+		while self.infinite and not self.stop_event.is_set():
+			self.stop_event.wait(0.01)
+		self.send("bestmove " + (str(move) if move is not None else "0000"))
+
+	def recover_move(self,root_stack_size):
+		try:
+			while len(self.board.move_stack) > root_stack_size:
+				self.board.pop()
+			for move in self.board.legal_moves():
+				return move
+		except Exception as e:
+			self.send("info string position error " + type(e).__name__ + ": " + str(e))
+		return None
+
+	def stop_search(self):
+		if self.search_thread is not None:
+			self.infinite = False
+			self.search.stop()
+			self.stop_event.set()
+			self.search_thread.join()
+			self.search_thread = None
+
+	def send_info(self,result):
+		elapsed_ms = int(result.elapsed*1000)
+		info = "info depth " + str(result.depth) + " score " + format_uci_score(result.score) + " nodes " + str(result.nodes) + " nps " + str(result.nodes_per_second()) + " time " + str(elapsed_ms)
+		if result.move is not None:
+			info += " pv " + str(result.move)
+		self.send(info)
+
+	def send(self,message):
+		with self.output_lock:
+			self.output_stream.write(message + "\n")
+			self.output_stream.flush()
+
+def parse_go_arguments(arguments):
+	limits = {}
+	index = 0
+	while index < len(arguments):
+		argument = arguments[index]
+		if argument in ("infinite","ponder"):
+			limits[argument] = True
+			index += 1
+		elif index+1 < len(arguments) and arguments[index+1].lstrip("-").isdigit():
+			limits[argument] = int(arguments[index+1])
+			index += 2
+		else:
+			index += 1
+	return limits
+
+def allocate_movetime(limits,turn_color):
+	prefix = "w" if turn_color == "white" else "b"
+	time_left = limits.get(prefix + "time")
+	if time_left is None:
+		return None
+	increment = limits.get(prefix + "inc",0)
+	moves_to_go = limits.get("movestogo",DEFAULT_MOVES_TO_GO)
+	movetime = time_left//max(moves_to_go,1) + increment*3//4
+	return max(min(movetime,time_left-MOVE_OVERHEAD),MIN_MOVETIME)
+
+def format_uci_score(score):
+	if score >= MATE_BOUND:
+		return "mate " + str((MATE_SCORE - score + 1)//2)
+	elif score <= -MATE_BOUND:
+		return "mate -" + str((MATE_SCORE + score)//2)
+	return "cp " + str(score)
+
+def run_uci():
+	UCISession().run()